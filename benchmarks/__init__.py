@@ -0,0 +1 @@
+"""Benchmarks guarding plshandle against performance regressions."""
@@ -0,0 +1,74 @@
+"""Measure the cost of looking up the contracts of a called function.
+
+Run it with ``python -m benchmarks.contract_index``. The per-call cost of the index should stay
+roughly constant while the linear scan it replaced grows with the number of contracts.
+"""
+
+from argparse import ArgumentParser
+import sys
+import timeit
+from typing import List
+
+from mypy.nodes import Block, FuncDef
+from mypy.modulefinder import BuildSource
+
+from plshandle._contract_index import ContractIndex
+from plshandle._visitors.contract_collector import Contract
+
+
+def _make_function(name: str) -> FuncDef:
+    function = FuncDef(name, [], Block([]))
+    function._fullname = "bench.{}".format(name)  # pylint: disable=protected-access
+    return function
+
+
+def _make_contracts(count: int) -> List[Contract]:
+    source = BuildSource("bench.py", "bench", None, None)
+    return [Contract(source, _make_function("f{}".format(i)), ()) for i in range(count)]
+
+
+def _linear_scan(contracts, functions):
+    return [contract for contract in contracts if contract.function in functions]
+
+
+def measure(count: int, calls: int) -> dict:
+    """Return the average cost in nanoseconds of one call site lookup for ``count`` contracts."""
+    contracts = _make_contracts(count)
+    index = ContractIndex(contracts)
+    # half of the call sites call a contract function, the other half an unrelated function
+    call_sites = [
+        (contracts[i % count].function,) if i % 2 else (_make_function("other"),)
+        for i in range(calls)
+    ]
+
+    def indexed():
+        for functions in call_sites:
+            list(index.lookup(functions))
+
+    def scanned():
+        for functions in call_sites:
+            _linear_scan(contracts, functions)
+
+    return {
+        "contracts": count,
+        "index_ns": min(timeit.repeat(indexed, number=1, repeat=3)) / calls * 1e9,
+        "scan_ns": min(timeit.repeat(scanned, number=1, repeat=3)) / calls * 1e9,
+    }
+
+
+def main(argv=None):
+    """Print per-call lookup cost for a growing number of contracts."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--contracts", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    args = parser.parse_args(argv)
+
+    print("{:>10} {:>14} {:>14}".format("contracts", "index ns/call", "scan ns/call"))
+    for count in args.contracts:
+        result = measure(count, args.calls)
+        print("{contracts:>10} {index_ns:>14.0f} {scan_ns:>14.0f}".format(**result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
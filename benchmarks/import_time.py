@@ -0,0 +1,80 @@
+"""Measure the import time of the runtime decorator using ``python -X importtime``.
+
+Run it with ``python -m benchmarks.import_time``. Exits with code 1 if importing the decorator
+pulls in any of the heavy dependencies only needed for checking.
+"""
+
+from argparse import ArgumentParser
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+_STATEMENT = "from plshandle import plshandle"
+_FORBIDDEN = ("mypy", "setuptools", "toml")
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    # lines look like "import time:  self [us] | cumulative | imported package"
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [field.strip() for field in line[len("import time:") :].split("|")]
+        if len(fields) != 3 or not fields[0].isdigit():
+            continue  # header line
+        entries.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return entries
+
+
+def measure(statement: str = _STATEMENT, repeat: int = 5) -> Dict[str, object]:
+    """Import ``statement`` in fresh interpreters and return the best cumulative time of the
+    ``plshandle`` package and the modules it imported.
+    """
+    best = None
+    modules: List[str] = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        entries = _parse_importtime(process.stderr)
+        cumulative = next(cum for name, _, cum in entries if name == "plshandle")
+        if best is None or cumulative < best:
+            best = cumulative
+            modules = [name for name, _, _ in entries]
+
+    return {
+        "statement": statement,
+        "cumulative_us": best,
+        "modules": len(modules),
+        "forbidden": sorted(name for name in modules if name.split(".")[0] in _FORBIDDEN),
+    }
+
+
+def main(argv=None):
+    """Print the measurement and fail if forbidden modules were imported or the budget exceeded."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="fail above this time")
+    args = parser.parse_args(argv)
+
+    result = measure(repeat=args.repeat)
+    print(
+        "{statement}: {ms:.2f} ms, {modules} modules".format(
+            ms=result["cumulative_us"] / 1000, **result
+        )
+    )
+    if result["forbidden"]:
+        print("error: imported {}".format(", ".join(result["forbidden"])), file=sys.stderr)
+        return 1
+    if result["cumulative_us"] / 1000 > args.budget_ms:
+        print("error: import time exceeds {} ms".format(args.budget_ms), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
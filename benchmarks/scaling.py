@@ -0,0 +1,224 @@
+"""Measure how the phases of a run scale with the size of a synthetic code base.
+
+Run it with ``python -m benchmarks.scaling``. For each module count, a package is generated (see
+``benchmarks.synthetic``) and gathering modules, the mypy build, collecting contracts, checking
+contracts and building the JSON output are measured, as well as collecting and checking them in a
+single pass (``ContractEngine``) and inferring contracts along the call graph
+(``ContractInference``). The time per module of the plshandle phases should stay roughly constant,
+growing much faster hints at an O(n^2) regression. Results can be written to a JSON file
+and compared against a previous run using ``--baseline``. With ``--release``,
+each module count is measured a second time releasing the AST of each module once it is checked
+(like ``--compact``) and the reduction of the peak memory is reported.
+"""
+
+from argparse import ArgumentParser
+from dataclasses import fields
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from mypy.options import Options
+from mypy.version import __version__ as mypy_version
+
+from benchmarks.synthetic import Parameters, generate
+from plshandle._cache import MypyCache
+from plshandle._cli_utils.build_json import build_json
+from plshandle._gather_modules import gather_modules
+from plshandle._inference import ContractInference
+from plshandle._profile import Profile
+from plshandle._records import to_record
+from plshandle._visitors.contract_checker import ContractChecker
+from plshandle._visitors.contract_collector import ContractCollector
+from plshandle._visitors.contract_engine import ContractEngine
+
+
+_VERSION = 1
+SCALING_PHASES = (
+    "ContractEngine",
+    "ContractCollector",
+    "ContractInference",
+    "ContractChecker",
+    "build_json",
+)
+_MIN_SECONDS = 0.01  # ignore phases too short to be compared reliably
+
+
+def measure(parameters: Parameters, release: bool = False) -> dict:
+    """Generate a package and measure all phases of checking it, releasing the AST of each module
+    once it is checked if ``release`` is set.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        package = "synthetic_{}".format(parameters.modules)
+        generate(directory, package, parameters)
+        sys.path.insert(0, directory)
+        try:
+            options = Options()
+            options.incremental = False
+
+            profile = Profile()
+            package_roots: List[str] = []
+            with profile.phase("gather_modules"):
+                modules = list(gather_modules([], [package], [], package_roots))
+            options.package_root = package_roots
+            with profile.phase("MypyCache"):
+                cache = MypyCache(modules, options)
+            with profile.phase("ContractEngine"):
+                ContractEngine(modules, cache)
+            with profile.phase("ContractCollector"):
+                contracts = ContractCollector(modules, cache).contracts
+            with profile.phase("ContractInference"):
+                ContractInference().infer(contracts, modules, cache)
+            with profile.phase("ContractChecker"):
+                checker = ContractChecker(contracts, modules, cache, release=release)
+            with profile.phase("build_json"):
+                build_json([to_record(result) for result in checker.results])
+        finally:
+            sys.path.remove(directory)
+
+    return {
+        "modules": len(modules),
+        "contracts": len(contracts),
+        "reports": sum(len(result.reports) for result in checker.results),
+        "peak_memory": profile.phases[-1].peak_memory,
+        "phases": {
+            phase.name: {
+                "wall_time": phase.wall_time,
+                "cpu_time": phase.cpu_time,
+                "peak_memory": phase.peak_memory,
+            }
+            for phase in profile.phases
+        },
+    }
+
+
+def _isolated(parameters: Parameters, release: bool = False) -> dict:
+    # the peak memory of a process never decreases, so measure each run in a fresh process
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return measure(parameters, release)
+    with multiprocessing.get_context("fork").Pool(1) as pool:
+        return pool.apply(measure, (parameters, release))
+
+
+def _per_module(run: dict, phase: str) -> float:
+    return run["phases"][phase]["wall_time"] / run["modules"]
+
+
+def check_scaling(runs: List[dict], max_growth: float) -> List[str]:
+    """Compare the time per module of the smallest and the largest run. Returns a message for each
+    phase whose time per module grew by more than ``max_growth``.
+    """
+    smallest, largest = runs[0], runs[-1]
+    problems = []
+    for phase in SCALING_PHASES:
+        if largest["phases"][phase]["wall_time"] < _MIN_SECONDS:
+            continue
+        growth = _per_module(largest, phase) / max(_per_module(smallest, phase), 1e-9)
+        if growth > max_growth:
+            problems.append(
+                "{}: time per module grew {:.1f}x from {} to {} modules".format(
+                    phase, growth, smallest["modules"], largest["modules"]
+                )
+            )
+    return problems
+
+
+def compare(runs: List[dict], baseline: dict, max_slowdown: float) -> List[str]:
+    """Compare against the runs of a baseline with the same module counts. Returns a message for
+    each phase that got slower by more than ``max_slowdown``.
+    """
+    previous: Dict[int, dict] = {run["modules"]: run for run in baseline["runs"]}
+    problems = []
+    for run in runs:
+        if run["modules"] not in previous:
+            continue
+        for phase, measured in run["phases"].items():
+            before = previous[run["modules"]]["phases"].get(phase)
+            if not before or measured["wall_time"] < _MIN_SECONDS:
+                continue
+            slowdown = measured["wall_time"] / max(before["wall_time"], 1e-9)
+            if slowdown > max_slowdown:
+                problems.append(
+                    "{} modules, {}: {:.3f}s -> {:.3f}s ({:.1f}x)".format(
+                        run["modules"], phase, before["wall_time"], measured["wall_time"], slowdown
+                    )
+                )
+    return problems
+
+
+def _print_runs(runs: List[dict]):
+    phases = list(runs[0]["phases"])
+    print("{:>8} {:>9} {:>8}".format("modules", "contracts", "reports"), end="")
+    print("".join(" {:>18}".format(phase) for phase in phases))
+    for run in runs:
+        print("{modules:>8} {contracts:>9} {reports:>8}".format(**run), end="")
+        print("".join(" {:>17.3f}s".format(run["phases"][phase]["wall_time"]) for phase in phases))
+
+
+def _print_memory(runs: List[dict]):
+    print("{:>8} {:>18} {:>18} {:>10}".format("modules", "peak memory", "released", "reduction"))
+    for run in runs:
+        peak, released = run["peak_memory"], run["released"]["peak_memory"]
+        if peak is None or released is None:
+            continue  # unknown on this platform
+        print(
+            "{:>8} {:>14} KiB {:>14} KiB {:>9.1f}%".format(
+                run["modules"], peak, released, 100 * (peak - released) / peak
+            )
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    """Measure all phases for each module count, returns a non-zero exit code on regressions."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, nargs="+", default=[25, 100])
+    for field_ in fields(Parameters):
+        if field_.name != "modules":
+            parser.add_argument("--{}".format(field_.name), type=int, default=field_.default)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results in this JSON file")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    parser.add_argument(
+        "--release",
+        action="store_true",
+        help="also measure releasing the AST of each module once it is checked",
+    )
+    args = parser.parse_args(argv)
+
+    shape = {f.name: getattr(args, f.name) for f in fields(Parameters) if f.name != "modules"}
+    runs = [_isolated(Parameters(modules=modules, **shape)) for modules in sorted(args.modules)]
+    _print_runs(runs)
+    if args.release:
+        for run in runs:
+            run["released"] = _isolated(Parameters(modules=run["modules"], **shape), True)
+        _print_memory(runs)
+
+    results = {
+        "version": _VERSION,
+        "python": platform.python_version(),
+        "mypy": mypy_version,
+        "parameters": shape,
+        "runs": runs,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    problems = check_scaling(runs, args.max_growth) if len(runs) > 1 else []
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("version") != _VERSION or baseline.get("parameters") != shape:
+            print("warning: baseline was measured with other parameters", file=sys.stderr)
+        problems += compare(runs, baseline, args.max_slowdown)
+
+    for problem in problems:
+        print("regression: {}".format(problem), file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
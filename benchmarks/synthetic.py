@@ -0,0 +1,118 @@
+"""Generate synthetic packages using plshandle, see ``Parameters`` for what can be scaled."""
+
+from dataclasses import dataclass
+import os
+from typing import List
+
+
+@dataclass(frozen=True)
+class Parameters:
+    """Shape of a synthetic package."""
+
+    modules: int = 50  #: number of modules, each module imports the previous one
+    contracts: int = 5  #: contract functions and caller functions per module
+    calls: int = 5  #: call sites per caller function
+    nesting: int = 2  #: nested try statements around the call sites
+    aliases: int = 3  #: length of the alias chain to a contract function per module
+    hierarchy: int = 3  #: depth of the exception class hierarchy
+    unions: int = 2  #: number of classes in the union type of the callee of a method call
+
+
+def _exceptions(parameters: Parameters) -> str:
+    lines = ["class E0(Exception):", "    pass", ""]
+    for depth in range(1, parameters.hierarchy):
+        lines += ["", "class E{}(E{}):".format(depth, depth - 1), "    pass", ""]
+    return "\n".join(lines)
+
+
+def _call(index: int, call: int, parameters: Parameters) -> str:
+    # cycle through the different kinds of call sites
+    kind = call % 4
+    if kind == 1 and index:
+        return "previous.f{}()".format(call % parameters.contracts)
+    if kind == 2 and parameters.aliases:
+        return "a{}()".format(parameters.aliases - 1)
+    if kind == 3 and parameters.unions:
+        return "callee(C{}())".format(call % parameters.unions)
+    return "f{}()".format(call % parameters.contracts)
+
+
+def _caller(index: int, caller: int, parameters: Parameters) -> List[str]:
+    lines = ["", "", "def caller{}():".format(caller)]
+    indent = "    "
+    for _ in range(parameters.nesting):
+        lines.append(indent + "try:")
+        indent += "    "
+    lines += [
+        indent + _call(index, caller + call, parameters) for call in range(max(1, parameters.calls))
+    ]
+    # the innermost handler catches the most specific exception
+    for level in range(parameters.nesting):
+        indent = indent[:-4]
+        exception = max(0, parameters.hierarchy - 1 - level)
+        lines += [indent + "except E{}:".format(exception), indent + "    pass"]
+    return lines
+
+
+def _module(index: int, package: str, parameters: Parameters) -> str:
+    hierarchy = max(1, parameters.hierarchy)
+    lines = [
+        "from typing import Union",
+        "",
+        "from plshandle import plshandle",
+        "",
+        "from {}.exceptions import {}".format(
+            package, ", ".join("E{}".format(depth) for depth in range(hierarchy))
+        ),
+    ]
+    if index:
+        lines.append("from {} import m{} as previous".format(package, index - 1))
+
+    for contract in range(parameters.contracts):
+        lines += [
+            "",
+            "",
+            "@plshandle(E{})".format(contract % hierarchy),
+            "def f{}():".format(contract),
+            "    pass",
+        ]
+
+    lines.append("")
+    for alias in range(parameters.aliases):
+        lines.append("a{} = {}".format(alias, "a{}".format(alias - 1) if alias else "f0"))
+
+    for union in range(parameters.unions):
+        lines += [
+            "",
+            "",
+            "class C{}:".format(union),
+            "    @plshandle(E{})".format(union % hierarchy),
+            "    def run(self):",
+            "        pass",
+        ]
+    if parameters.unions:
+        lines += [
+            "",
+            "",
+            "def callee(x: Union[{}]):".format(
+                ", ".join("C{}".format(union) for union in range(parameters.unions))
+            ),
+            "    x.run()",
+        ]
+
+    for caller in range(parameters.contracts):
+        lines += _caller(index, caller, parameters)
+    return "\n".join(lines) + "\n"
+
+
+def generate(directory: str, package: str, parameters: Parameters):
+    """Write the package ``package`` to ``directory``."""
+    if parameters.contracts < 1:
+        raise ValueError("at least one contract per module is required")
+    root = os.path.join(directory, package)
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, "exceptions.py"), "w") as file:
+        file.write(_exceptions(parameters))
+    for index in range(parameters.modules):
+        with open(os.path.join(root, "m{}.py".format(index)), "w") as file:
+            file.write(_module(index, package, parameters))
@@ -1,7 +1,39 @@
 """Create a contract between caller and function that requires the caller to handle specific
 exceptions raised by the function.
 """
-from ._cli import cli
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from ._decorator import plshandle
-from ._visitors.contract_collector import Contract
-from ._visitors.contract_checker import CheckResult, ContractReport, ExceptionResult
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ._cli import cli
+    from ._session import Session
+    from ._visitors.contract_collector import Contract
+    from ._visitors.contract_checker import CheckResult, ContractReport, ExceptionResult
+
+
+# everything except the decorator depends on mypy, so only import it on first access
+_LAZY_ATTRIBUTES = {
+    "cli": "._cli",
+    "Session": "._session",
+    "Contract": "._visitors.contract_collector",
+    "CheckResult": "._visitors.contract_checker",
+    "ContractReport": "._visitors.contract_checker",
+    "ExceptionResult": "._visitors.contract_checker",
+}
+
+
+def __getattr__(name: str):
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name)) from None
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # cache it, subsequent lookups won't hit __getattr__ anymore
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -4,37 +4,29 @@ exceptions raised by the function.
 
 import sys
 
-from plshandle._cli import cli
-from plshandle._cli_utils.build_json import build_json
-from plshandle._cli_utils.build_version import build_version
-from plshandle._cli_utils.collect_errors import collect_errors
-from plshandle._cli_utils.collect_verbose_messages import collect_verbose_messages
-from plshandle._cli_utils.determine_exit_code import determine_exit_code
-from plshandle._version import __version__
+from plshandle._cli import _parse_config, cli
+from plshandle._cli_utils.print_output import print_output
+
+
+def main(argv):
+    """Run plshandle or one of its subcommands and return the exit code."""
+    if argv[:1] == ["daemon"]:
+        from plshandle._daemon import daemon_main  # pylint: disable=import-outside-toplevel
+
+        return daemon_main(argv[1:])
+    if argv[:1] == ["merge"]:
+        from plshandle._merge import merge_main  # pylint: disable=import-outside-toplevel
+
+        return merge_main(argv[1:])
+
+    config = _parse_config(argv, cli.__doc__)
+    if config.watch:
+        from plshandle._watch import Watcher  # pylint: disable=import-outside-toplevel
+
+        return Watcher(config).run()
+
+    return print_output(cli(argv), sys.stdout, sys.stderr)
 
 
 if __name__ == "__main__":
-    cli_output = cli(sys.argv[1:])
-
-    if cli_output.config.verbose:
-        for msg in collect_verbose_messages(cli_output):
-            print(msg)
-
-    if cli_output.config.version:
-        print(build_version())
-    elif cli_output.config.help_requested:
-        pass  # prevent printing the rest if help was requested
-    elif not cli_output.modules:
-        print("error: No modules found", file=sys.stderr)
-    elif not cli_output.contracts:
-        print("error: No contracts found", file=sys.stderr)
-    elif not any(result.reports for result in cli_output.results):
-        print("error: No contracts checked", file=sys.stderr)
-
-    if cli_output.config.json:
-        print(build_json(cli_output.results))
-
-    for msg in collect_errors(cli_output):
-        print(msg, file=sys.stderr)
-
-    sys.exit(determine_exit_code(cli_output))
+    sys.exit(main(sys.argv[1:]))
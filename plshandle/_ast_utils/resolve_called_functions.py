@@ -108,10 +108,14 @@ def _resolve_class_types(
                 yield from _resolve_class_types(item, fallback_method)
         elif isinstance(type_, FunctionLike):  # pragma: no branch
             if isinstance(type_, Overloaded):  # pragma: no branch
-                type_ = type_.items()[0]
+                items = type_.items  # a method before mypy 0.940, a property since then
+                type_ = (items() if callable(items) else items)[0]  # pragma: no cover
             # just in case Python ever receives another function-like statement
             if isinstance(type_, CallableType):  # pragma: no branch
-                yield from _resolve_class_types(type_.ret_type, fallback_method)
+                if type_.is_type_obj():  # e.g. ``cls`` of a class method
+                    yield from _resolve_class_types(type_.type_object(), "__init__")
+                else:
+                    yield from _resolve_class_types(type_.ret_type, fallback_method)
 
 
 def _try_get_callee_method(callee: Expression) -> Optional[str]:
@@ -132,28 +136,68 @@ def _find_method(class_: TypeInfo, method: str) -> Optional[FuncDef]:
     return None
 
 
-def _find_methods(type_: Type, callee: Expression) -> Iterator[FuncDef]:
-    for class_, fallback_method in _resolve_class_types(type_):
-        method = _find_method(class_, _try_get_callee_method(callee) or fallback_method)
+class MethodCache:
+    """Memoize the classes a callee type resolves to and the methods found in their MRO, so both
+    are resolved once per run instead of once per call expression.
+    """
+
+    def __init__(self):
+        self._classes: Dict[Optional[Type], Tuple[Tuple[TypeInfo, Optional[str]], ...]] = {}
+        self._methods: Dict[Tuple[TypeInfo, str], Optional[FuncDef]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def classes(self, type_: Optional[Type]) -> Tuple[Tuple[TypeInfo, Optional[str]], ...]:
+        """Get the classes and fallback methods of ``type_``, see ``_resolve_class_types()``."""
+        try:
+            classes = self._classes[type_]
+            self.hits += 1
+        except KeyError:
+            classes = self._classes[type_] = tuple(_resolve_class_types(type_))
+            self.misses += 1
+        return classes
+
+    def method(self, class_: TypeInfo, method: str) -> Optional[FuncDef]:
+        """Get ``method`` of ``class_`` or one of its bases, see ``_find_method()``."""
+        key = (class_, method)
+        try:
+            function = self._methods[key]
+            self.hits += 1
+        except KeyError:
+            function = self._methods[key] = _find_method(class_, method)
+            self.misses += 1
+        return function
+
+
+def _find_methods(
+    type_: Optional[Type], callee: Expression, cache: Optional[MethodCache] = None
+) -> Iterator[FuncDef]:
+    cache = cache or MethodCache()
+    for class_, fallback_method in cache.classes(type_):
+        method = cache.method(class_, _try_get_callee_method(callee) or fallback_method)
         if method:
             yield method
 
 
 def _resolve_bound_functions(
-    callee: Expression, types: Dict[Expression, Type]
+    callee: Expression, types: Dict[Expression, Type], cache: Optional[MethodCache] = None
 ) -> Iterator[FuncDef]:
-    yield from _find_methods(_find_callee_type(callee, types), callee)
+    yield from _find_methods(_find_callee_type(callee, types), callee, cache)
 
 
 def resolve_called_functions(
-    call: CallExpr, resolver: AliasResolver, types: Dict[Expression, Type]
+    call: CallExpr,
+    resolver: AliasResolver,
+    types: Dict[Expression, Type],
+    cache: Optional[MethodCache] = None,
 ) -> Iterator[FuncDef]:
     """Yield the called functions from a call expression. This might yield multiple functions
-    since the underlying callee might be an union type.
+    since the underlying callee might be an union type. Methods are looked up in the optional
+    ``cache``.
     """
 
     function = _resolve_unbound_function(call.callee, resolver)
     if function:
         yield function
     else:
-        yield from _resolve_bound_functions(call.callee, types)
+        yield from _resolve_bound_functions(call.callee, types, cache)
@@ -1,6 +1,6 @@
 """Attempt to resolve a Type[BaseException] from a mypy.types.Type."""
 
-from typing import Optional, Iterator
+from typing import Dict, Optional, Iterator
 
 from mypy.types import Type, Instance, TypeType, TupleType, CallableType, Overloaded
 from mypy.nodes import Context, TypeInfo
@@ -10,6 +10,40 @@ def _is_exception_type(type_: TypeInfo):
     return any(sub.fullname == "builtins.BaseException" for sub in type_.mro)  # pragma: no branch
 
 
+class ExceptionIndex:
+    """Interned ids and ancestor bitsets of all exception types seen so far, so checking whether a
+    type is an exception type does not scan any MRO more than once per type.
+    """
+
+    def __init__(self):
+        self._ids: Dict[TypeInfo, int] = {}
+        self._ancestors: Dict[TypeInfo, int] = {}  # 0 if not an exception type
+
+    def ancestors(self, type_: TypeInfo) -> int:
+        """Bitset of the ids of ``type_`` and all its exception base classes, ``0`` if ``type_``
+        is not an exception type.
+        """
+        try:
+            return self._ancestors[type_]
+        except KeyError:
+            pass
+
+        bits = 0
+        if type_.fullname == "builtins.BaseException":
+            bits = 1 << self._ids.setdefault(type_, len(self._ids))
+        else:
+            for base in type_.bases:
+                bits |= self.ancestors(base.type)
+            if bits:
+                bits |= 1 << self._ids.setdefault(type_, len(self._ids))
+        self._ancestors[type_] = bits
+        return bits
+
+    def is_exception_type(self, type_: TypeInfo) -> bool:
+        """Same as ``_is_exception_type()``, but memoized."""
+        return self.ancestors(type_) != 0
+
+
 def _raise_invalid_type(type_: Type, context: Optional[Context], module: Optional[str]):
     raise TypeError(
         "{}:{}: Invalid exception type '{}'".format(
@@ -19,10 +53,14 @@ def _raise_invalid_type(type_: Type, context: Optional[Context], module: Optiona
 
 
 def resolve_exception_types(
-    type_: Type, context: Optional[Context], module: Optional[str]
+    type_: Type,
+    context: Optional[Context],
+    module: Optional[str],
+    index: Optional[ExceptionIndex] = None,
 ) -> Iterator[TypeInfo]:
     """Attempt to resolve a Type[BaseException] or Tuple[Type[BaseException], ...] (nested) from a
-    mypy.types.Type. Raises ``TypeError`` if failed to resolve.
+    mypy.types.Type. Raises ``TypeError`` if failed to resolve. Exception types are validated
+    using the optional ``index``.
     """
     if isinstance(type_, Overloaded):
         type_ = type_.items()[0]
@@ -31,9 +69,10 @@ def resolve_exception_types(
 
     if isinstance(type_, TupleType):
         for item in type_.items:  # pragma: no branch
-            yield from resolve_exception_types(item, context, module)
+            yield from resolve_exception_types(item, context, module, index)
     elif isinstance(type_, TypeType) and isinstance(type_.item, Instance):  # pragma: no branch
-        if _is_exception_type(type_.item.type):
+        is_exception_type = index.is_exception_type if index else _is_exception_type
+        if is_exception_type(type_.item.type):
             yield type_.item.type
         else:
             _raise_invalid_type(type_, context, module)
@@ -1,24 +1,78 @@
 """Mypy build cache."""
 
+import tokenize
 from typing import Sequence
 
 from mypy.build import build
+from mypy.freetree import free_tree
 from mypy.fscache import FileSystemCache
 from mypy.options import Options
 from mypy.modulefinder import BuildSource
+from mypy.server.subexpr import get_subexpressions
+from mypy.server.update import FineGrainedBuildManager
+
+
+def _with_text(source: BuildSource) -> BuildSource:
+    with tokenize.open(source.path) as file:
+        return BuildSource(source.path, source.module, file.read(), source.base_dir)
 
 
 class MypyCache:
-    """Cache mypy's AST and type maps."""
+    """Cache mypy's AST and type maps. If ``fine_grained`` is set, the build can be updated in
+    place using ``update()``.
+    """
 
-    def __init__(self, sources: Sequence[BuildSource], options: Options = Options()):
+    def __init__(
+        self,
+        sources: Sequence[BuildSource],
+        options: Options = Options(),
+        fine_grained: bool = False,
+    ):
         # we need these to traverse the AST later on
         options.preserve_asts = True
         options.export_types = True
         options.check_untyped_defs = True
+        if fine_grained:
+            options.fine_grained_incremental = True
+            options.local_partial_types = True  # required by fine-grained mode
 
         # make mypy cache type info to improve performance on subsequent runs
         fs_cache = FileSystemCache()
         fs_cache.set_package_root(options.package_root)
 
+        # mypy does not even load the AST of modules that are fresh in its cache, so pass the
+        # source text of our modules which makes mypy always analyze them, but not their imports
+        if options.incremental:
+            sources = [_with_text(source) for source in sources]
+
+        self.options = options
         self.build = build(list(sources), options, None, None, fs_cache) if sources else None
+        self._fine_grained = (
+            FineGrainedBuildManager(self.build) if fine_grained and self.build else None
+        )
+
+    def update(self, changed: Sequence[BuildSource], removed: Sequence[BuildSource] = ()):
+        """Re-analyze changed (or added) and removed modules and the parts of other modules
+        affected by them. Nodes of unchanged modules keep their identity.
+        """
+        if not self._fine_grained:
+            raise ValueError("MypyCache was not created with fine_grained=True")
+
+        self.build.manager.fscache.flush()
+        self._fine_grained.flush_cache()
+        self._fine_grained.update(
+            [(source.module, source.path) for source in changed],
+            [(source.module, source.path) for source in removed],
+        )
+
+    def release(self, module: str):
+        """Free the AST of a module and drop its expressions from the type map once it is not
+        traversed anymore. Functions and classes stay in the symbol tables, but without bodies.
+        """
+        if self._fine_grained:
+            raise ValueError("modules of a fine-grained MypyCache cannot be released")
+
+        tree = self.build.files[module]
+        for expression in get_subexpressions(tree):
+            self.build.types.pop(expression, None)
+        free_tree(tree)
@@ -0,0 +1,64 @@
+"""Determine the modules affected by changed files or depending on other modules."""
+
+from collections import deque
+import os
+import subprocess
+from typing import Dict, Iterable, List, Mapping, Set
+
+from mypy.build import State
+
+
+def _git(*args: str) -> List[str]:
+    process = subprocess.run(
+        ["git", *args], stdout=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    return process.stdout.splitlines()
+
+
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.realpath(path))
+
+
+def changed_files_since(ref: str) -> List[str]:
+    """List the files changed since the given git ref, including uncommitted and untracked
+    files. Raises ``subprocess.CalledProcessError`` if not in a git repository or if the ref is
+    invalid.
+    """
+    top_level = _git("rev-parse", "--show-toplevel")[0]
+    files = _git("diff", "--name-only", ref, "--")
+    files += _git("ls-files", "--others", "--exclude-standard", "--full-name", top_level)
+    return [os.path.join(top_level, file) for file in files]
+
+
+def dependent_modules(modules: Iterable[str], graph: Mapping[str, State]) -> Set[str]:
+    """Determine the given modules and all modules of the build graph (transitively) depending on
+    them, including the indirect dependencies mypy adds for types used in a module.
+    """
+    dependents: Dict[str, List[str]] = {}
+    for module, state in graph.items():
+        for dependency in state.dependencies:
+            dependents.setdefault(dependency, []).append(module)
+
+    queue = deque(module for module in modules if module in graph)
+    found = set(queue)
+    while queue:
+        for dependent in dependents.get(queue.popleft(), ()):
+            if dependent not in found:
+                found.add(dependent)
+                queue.append(dependent)
+    return found
+
+
+def affected_modules(changed_files: Iterable[str], graph: Mapping[str, State]) -> Set[str]:
+    """Determine the modules of the build graph that are defined in one of the changed files or
+    (transitively) depend on such a module.
+    """
+    changed = {_normalize(file) for file in changed_files}
+    return dependent_modules(
+        (
+            module
+            for module, state in graph.items()
+            if state.path and _normalize(state.path) in changed
+        ),
+        graph,
+    )
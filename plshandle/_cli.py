@@ -1,17 +1,40 @@
 """Command-line interface of plshandle."""
 
-from argparse import ArgumentParser
-from dataclasses import dataclass
+from argparse import ArgumentParser, ArgumentTypeError
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import gc
 import sys
-from typing import Optional, List, Sequence, Tuple
+from typing import Callable, Dict, Iterator, Optional, List, Mapping, Sequence, Set, Tuple
 
 from mypy.options import Options
 
 from plshandle._cache import MypyCache
+from plshandle._changed_modules import affected_modules, changed_files_since, dependent_modules
+from plshandle._cli_utils.build_json import NdjsonWriter
 from plshandle._cli_utils.config import read_and_merge_config, Config
+from plshandle._contract_index import ContractIndex
+from plshandle._contract_store import ContractStore
+from plshandle._inference import ContractInference
+from plshandle._parallel import ParallelChecker, resolve_jobs
+from plshandle._profile import Profile
+from plshandle._records import ModuleRecord, to_record
+from plshandle._result_store import ResultStore
+from plshandle._shard import parse_shard, shard_modules
 from plshandle._visitors.contract_checker import ContractChecker, CheckResult
 from plshandle._visitors.contract_collector import ContractCollector, Contract
-from plshandle._gather_modules import gather_modules, BuildSource
+from plshandle._visitors.contract_engine import ContractEngine
+from plshandle._gather_modules import gather_modules, BuildSource, DirectoryCache, ModuleFilter
+
+
+def _shard_arg(value: str) -> Tuple[int, int]:
+    try:
+        return parse_shard(value)
+    except ValueError as exc:
+        raise ArgumentTypeError(
+            "invalid shard '{}', expected I/N with 1 <= I <= N".format(value)
+        ) from exc
 
 
 def _make_arg_parser(description: Optional[str] = None):
@@ -31,6 +54,32 @@ def _make_arg_parser(description: Optional[str] = None):
     parser.add_argument(
         "-m", "--module", action="append", help="additionally include these modules in the check"
     )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="PATTERN",
+        help="skip modules and packages of directories and packages whose path relative to the "
+        "directory matches this glob pattern, e.g. 'tests/*' or '*_pb2.py'",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help="only keep modules of directories and packages whose path relative to the directory "
+        "matches one of these glob patterns",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        metavar="BYTES",
+        help="skip modules of directories and packages larger than this",
+    )
+    parser.add_argument(
+        "--skip-generated",
+        action="store_true",
+        help="skip modules of directories and packages marked as generated in their first lines, "
+        "e.g. by '@generated' or 'DO NOT EDIT'",
+    )
     parser.add_argument(
         "--config",
         help="use a config file (CLI args override/extend it) (default: ./pyproject.toml)",
@@ -41,11 +90,90 @@ def _make_arg_parser(description: Optional[str] = None):
         # pylint: disable=line-too-long
         help="requires the try block and its handlers to be exactly one level above the function call",
     )
+    parser.add_argument(
+        "--match-subclasses",
+        action="store_true",
+        help="handling or propagating a base class of an exception (e.g. LookupError for KeyError) "
+        "fulfills the contract as well",
+    )
+    parser.add_argument(
+        "--infer",
+        action="store_true",
+        help="infer the contracts of functions letting exceptions of the contracts they call "
+        "escape, so their callers need to handle them as well",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="only check modules affected by files changed since this git ref, reuse the cached "
+        "results of all other modules",
+    )
+    parser.add_argument(
+        "--changed-files",
+        nargs="+",
+        metavar="FILE",
+        help="only check modules affected by these changed files, reuse the cached results of all "
+        "other modules",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard_arg,
+        metavar="I/N",
+        help="only check the I-th of N shards of the modules, balanced by file size, merge the "
+        "JSON outputs of all shards using 'python -m plshandle merge'",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="check modules in N processes, 0 uses one per CPU (default: 1)",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
         help="prints a JSON array containing all checked contracts and their results to stdout",
     )
+    parser.add_argument(
+        "--output-format",
+        choices=["text", "json", "ndjson"],
+        help="json is the same as --json, ndjson prints one JSON object per checked contract as "
+        "soon as its module is checked (default: text)",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="write the JSON or NDJSON output to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="prints wall time, CPU time and peak memory per phase and the slowest modules to "
+        "stderr, as JSON if --json is passed",
+    )
+    parser.add_argument(
+        "--profile-stats",
+        metavar="FILE",
+        help="dumps cProfile stats of the check phase to this file, see the pstats module",
+    )
+    parser.add_argument(
+        "--single-pass",
+        action="store_true",
+        help="collect and check contracts in a single traversal of each module, not used with "
+        "--infer, --jobs, --changed-since or --changed-files",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="release the AST of each module once it is checked and only keep compact records of "
+        "the check results, lowers the memory used for large code bases",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and check the modules affected by changed files again whenever files "
+        "are saved, until interrupted",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -61,29 +189,271 @@ def _make_arg_parser(description: Optional[str] = None):
 
 @dataclass(frozen=True)
 class CLIResult:
-    """All arguments, collected modules, contracts and check results."""
+    """All arguments, collected modules, contracts and check results. ``records`` are the check
+    results without references to the mypy build, with ``--compact`` there are only records.
+    """
 
     config: Config
     modules: Sequence[BuildSource]
     contracts: Sequence[Contract]
     results: Sequence[CheckResult]
+    statistics: Mapping[str, int] = field(default_factory=dict)
+    profile: Optional[Profile] = None
+    records: Optional[Sequence[ModuleRecord]] = None
+
+    def __post_init__(self):
+        if self.records is None:
+            object.__setattr__(self, "records", [to_record(result) for result in self.results])
+
 
+def _prepend_to_sys_path(paths: Sequence[str]):
+    # only prepend missing paths, cli() might be called repeatedly in the same process
+    sys.path[:0] = [path for path in dict.fromkeys(paths) if path not in sys.path]
 
-def _collect_modules_and_package_roots(args: Config) -> Tuple[Sequence[BuildSource], List[str]]:
-    sys.path[:0] = list(args.directory or [])  # be able to find module specs
+
+def _collect_modules_and_package_roots(
+    args: Config,
+    cache: Optional[DirectoryCache] = None,
+    statistics: Optional[Dict[str, int]] = None,
+) -> Tuple[Sequence[BuildSource], List[str]]:
+    # be able to find the specs of packages and modules, mypy needs them to resolve imports too
+    _prepend_to_sys_path(list(args.directory or []))
 
     package_roots: List[str] = []
+    module_filter = ModuleFilter(
+        list(args.exclude or []),
+        list(args.include or []),
+        args.max_file_size,
+        args.skip_generated,
+    )
     modules = tuple(
-        gather_modules(args.directory or [], args.package or [], args.module or [], package_roots)
+        gather_modules(
+            args.directory or [],
+            args.package or [],
+            args.module or [],
+            package_roots,
+            cache,
+            module_filter,
+        )
     )
+    if statistics is not None:
+        statistics.update(module_filter.skipped)
     return modules, package_roots
 
 
-def _make_cache(modules: Sequence[BuildSource], package_roots: List[str], options: Options):
-    sys.path[:0] = package_roots  # be able to find all modules
+def _make_cache(
+    modules: Sequence[BuildSource],
+    package_roots: List[str],
+    options: Options,
+    fine_grained: bool = False,
+):
+    _prepend_to_sys_path(package_roots)  # be able to find all modules
 
     options.package_root = package_roots
-    return MypyCache(modules, options)
+    return MypyCache(modules, options, fine_grained)
+
+
+def _collect_contracts(
+    modules: Sequence[BuildSource], cache: MypyCache, statistics: Dict[str, int]
+) -> Sequence[Contract]:
+    store = ContractStore.from_options(cache.options)
+    contracts = ContractCollector(modules, cache, store).contracts
+    store.save()
+    if store.path:
+        statistics["contract store hits"] = store.hits
+        statistics["contract store misses"] = store.misses
+    return contracts
+
+
+def _infer_contracts(
+    config: Config,
+    modules: Sequence[BuildSource],
+    contracts: Sequence[Contract],
+    cache: MypyCache,
+    statistics: Dict[str, int],
+) -> Sequence[Contract]:
+    # modules neither defining contracts nor depending on such a module cannot call contracts
+    relevant = dependent_modules(
+        {contract.source.module for contract in contracts}, cache.build.graph
+    )
+    inference = ContractInference(config.match_subclasses)
+    inferred = inference.infer(
+        contracts, [source for source in modules if source.module in relevant], cache
+    )
+    statistics["inferred contracts"] = len(inferred)
+    return [*contracts, *inferred]
+
+
+def _settings(config: Config) -> Dict[str, bool]:
+    # the settings check results depend on
+    return {"match_subclasses": config.match_subclasses, "infer": config.infer}
+
+
+def _affected_modules(config: Config, cache: MypyCache) -> Optional[Set[str]]:
+    if config.changed_since is None and config.changed_files is None:
+        return None
+    changed_files = list(config.changed_files or [])
+    if config.changed_since is not None:
+        changed_files += changed_files_since(config.changed_since)
+    return affected_modules(changed_files, cache.build.graph)
+
+
+def _check_contracts(
+    config: Config,
+    modules: Sequence[BuildSource],
+    contracts: Sequence[Contract],
+    cache: MypyCache,
+    statistics: Dict[str, int],
+    profile: Profile,
+    on_result: Optional[Callable[[CheckResult], None]] = None,
+) -> Sequence[CheckResult]:
+    store = ResultStore.from_options(cache.options)
+    store.settings = _settings(config)
+
+    # modules neither defining contracts nor depending on such a module cannot call contracts
+    relevant = dependent_modules(
+        {contract.source.module for contract in contracts}, cache.build.graph
+    )
+    reused: Dict[str, CheckResult] = {
+        source.module: CheckResult(source, [])
+        for source in modules
+        if source.module not in relevant
+    }
+    statistics["skipped modules"] = len(reused)
+
+    affected = _affected_modules(config, cache)
+    if affected is not None:
+        statistics["affected modules"] = sum(source.module in affected for source in modules)
+        index = ContractIndex(contracts)
+        for source in modules:
+            if source.module in affected or source.module in reused:
+                continue
+            result = store.load(source, cache, index)
+            if result:
+                reused[source.module] = result
+
+    # with --compact, the trees of modules not checked anymore are not needed either
+    if config.compact:
+        for module in reused:
+            cache.release(module)
+
+    # pass the results on in the order of the modules while they are checked
+    pending = deque(modules)
+
+    def emit(result: Optional[CheckResult] = None):
+        while pending and (result is None or pending[0].module != result.source.module):
+            on_result(reused[pending.popleft().module])  # type: ignore
+        if result is not None:
+            pending.popleft()
+            on_result(result)  # type: ignore
+
+    to_check = [source for source in modules if source.module not in reused]
+    jobs = min(resolve_jobs(config.jobs or 1), len(to_check))
+    if jobs > 1:
+        checker = ParallelChecker(
+            contracts, to_check, cache, jobs, emit if on_result else None, config.match_subclasses
+        )
+        statistics["jobs"] = jobs
+    else:
+        checker = ContractChecker(
+            contracts,
+            to_check,
+            cache,
+            (),
+            emit if on_result else None,
+            config.compact,
+            config.match_subclasses,
+        )
+    if on_result:
+        emit()
+    profile.modules.update(checker.durations)
+    for result in checker.results:
+        store.store(result, cache)
+    store.save()
+
+    statistics["handler cache hits"] = checker.handler_cache.hits
+    statistics["handler cache misses"] = checker.handler_cache.misses
+    statistics["method cache hits"] = checker.method_cache.hits
+    statistics["method cache misses"] = checker.method_cache.misses
+    if store.path:
+        statistics["result store hits"] = store.hits
+        statistics["result store misses"] = store.misses
+
+    # keep the order of the modules, no matter whether checked or reused
+    checked = iter(checker.results)
+    return [reused.get(source.module) or next(checked) for source in modules]
+
+
+def _is_single_pass(config: Config) -> bool:
+    # reusing results of unaffected modules, checking in parallel and inferring contracts need
+    # the contracts first
+    return (
+        config.single_pass
+        and not config.infer
+        and resolve_jobs(config.jobs or 1) == 1
+        and config.changed_since is None
+        and config.changed_files is None
+    )
+
+
+def _collect_and_check_contracts(  # pylint: disable=too-many-arguments
+    config: Config,
+    modules: Sequence[BuildSource],
+    checked: Sequence[BuildSource],
+    cache: MypyCache,
+    statistics: Dict[str, int],
+    profile: Profile,
+    on_result: Optional[Callable[[CheckResult], None]] = None,
+) -> Tuple[Sequence[Contract], Sequence[CheckResult]]:
+    contract_store = ContractStore.from_options(cache.options)
+    result_store = ResultStore.from_options(cache.options)
+    result_store.settings = _settings(config)
+    engine = ContractEngine(
+        modules,
+        cache,
+        contract_store,
+        checked,
+        on_result,
+        config.compact,
+        config.match_subclasses,
+    )
+    contract_store.save()
+    profile.modules.update(engine.durations)
+    if not engine.contracts:
+        return engine.contracts, []
+    for result in engine.results:
+        result_store.store(result, cache)
+    result_store.save()
+
+    if contract_store.path:
+        statistics["contract store hits"] = contract_store.hits
+        statistics["contract store misses"] = contract_store.misses
+    statistics["handler cache hits"] = engine.handler_cache.hits
+    statistics["handler cache misses"] = engine.handler_cache.misses
+    statistics["method cache hits"] = engine.method_cache.hits
+    statistics["method cache misses"] = engine.method_cache.misses
+    return engine.contracts, engine.results
+
+
+@contextmanager
+def _streamed_output(config: Config) -> Iterator[Optional[Callable[[CheckResult], None]]]:
+    # the callback writing the results while they are checked, if the output format streams
+    if config.output_format != "ndjson":
+        yield None
+    elif config.output:
+        with open(config.output, "w") as file:
+            yield NdjsonWriter(file).write
+    else:
+        yield NdjsonWriter(sys.stdout).write
+
+
+def _parse_config(args: Sequence[str], description: Optional[str] = None) -> Config:
+    try:
+        config = read_and_merge_config(_make_arg_parser(description).parse_args(args))
+        config.help_requested = False
+    except SystemExit:  # pragma: no cover
+        config = Config(help_requested=True)
+    return config
 
 
 def cli(args, mypy_options: Options = Options()):
@@ -91,16 +461,44 @@ def cli(args, mypy_options: Options = Options()):
     modules/packages/directories and check whether their callers handle the exceptions passed to
     the decorator. Optionally accepts mypy options.
     """
-    try:
-        config = read_and_merge_config(_make_arg_parser(cli.__doc__).parse_args(args))
-        config.help_requested = False
-    except SystemExit:  # pragma: no cover
-        config = Config(help_requested=True)
+    config = _parse_config(args, cli.__doc__)
     if config.version or config.help_requested:  # pragma: no cover
         return CLIResult(config, [], [], [])
 
-    modules, package_roots = _collect_modules_and_package_roots(config)
-    cache = _make_cache(modules, package_roots, mypy_options)
-    contracts = ContractCollector(modules, cache).contracts if modules else []
-    results = ContractChecker(contracts, modules, cache).results if contracts else []
-    return CLIResult(config, modules, contracts, results)
+    statistics: Dict[str, int] = {}
+    profile = Profile()
+    with profile.phase("gather modules"):
+        modules, package_roots = _collect_modules_and_package_roots(config, None, statistics)
+    with profile.phase("mypy build"):
+        cache = _make_cache(modules, package_roots, mypy_options)
+    checked = shard_modules(modules, *config.shard) if config.shard else modules
+    if config.shard:
+        statistics["shard modules"] = len(checked)
+    if modules and _is_single_pass(config):
+        with profile.phase("collect and check contracts", config.profile_stats), _streamed_output(
+            config
+        ) as on_result:
+            contracts, results = _collect_and_check_contracts(
+                config, modules, checked, cache, statistics, profile, on_result
+            )
+    else:
+        with profile.phase("collect contracts"):
+            contracts = _collect_contracts(modules, cache, statistics) if modules else []
+        if config.infer and contracts:
+            with profile.phase("infer contracts"):
+                contracts = _infer_contracts(config, modules, contracts, cache, statistics)
+        with profile.phase("check contracts", config.profile_stats), _streamed_output(
+            config
+        ) as on_result:
+            results = (
+                _check_contracts(config, checked, contracts, cache, statistics, profile, on_result)
+                if contracts
+                else []
+            )
+
+    if config.compact:
+        records = [to_record(result) for result in results]
+        del results, cache
+        gc.collect()  # the build is full of reference cycles, release it before printing
+        return CLIResult(config, modules, contracts, [], statistics, profile, records)
+    return CLIResult(config, modules, contracts, results, statistics, profile)
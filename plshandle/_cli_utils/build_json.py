@@ -1,45 +1,94 @@
 """Build a JSON array from contract check results."""
 
 import json
-from typing import Sequence
+from typing import List, Sequence, TextIO
 
-from plshandle._cli import CheckResult
+from plshandle._records import ExceptionRecord, ModuleRecord, ReportRecord, to_record
+from plshandle._visitors.contract_checker import CheckResult
 
 
-def build_json(results: Sequence[CheckResult]) -> str:
+def _source(record: ModuleRecord) -> dict:
+    return {"path": record.path, "module": record.module,}
+
+
+def _report(report: ReportRecord) -> dict:
+    contract = {
+        "function": report.function,
+        "exceptions": list(report.exceptions),
+        "source": {"path": report.contract_path, "module": report.contract_module,},
+    }
+    if report.inferred:
+        contract["inferred"] = True
+    return {
+        "contract": contract,
+        "context": {"scope": report.scope, "line": report.line, "column": report.column,},
+        "results": [
+            {
+                "exception": exc_result.exception,
+                "is_propagated": exc_result.is_propagated,
+                "is_handled": exc_result.is_handled,
+                "level": exc_result.level,
+            }
+            for exc_result in report.results
+        ],
+    }
+
+
+def build_json(records: Sequence[ModuleRecord]) -> str:
     """Build a JSON array from contract check results."""
     return json.dumps(
         [
-            {
-                "source": {"path": result.source.path, "module": result.source.module,},
-                "reports": [
-                    {
-                        "contract": {
-                            "function": report.contract.function.fullname,
-                            "exceptions": [exc.fullname for exc in report.contract.exception_types],
-                            "source": {
-                                "path": report.contract.source.path,
-                                "module": report.contract.source.module,
-                            },
-                        },
-                        "context": {
-                            "scope": report.scope.fullname,
-                            "line": report.context.line,
-                            "column": report.context.column,
-                        },
-                        "results": [
-                            {
-                                "exception": exc_result.exception.fullname,
-                                "is_propagated": exc_result.is_propagated,
-                                "is_handled": exc_result.is_handled,
-                                "level": exc_result.level,
-                            }
-                            for exc_result in report.results
-                        ],
-                    }
-                    for report in result.reports
-                ],
-            }
-            for result in results
+            {"source": _source(record), "reports": [_report(report) for report in record.reports]}
+            for record in records
         ]
     )
+
+
+def _load_report(report: dict) -> ReportRecord:
+    contract, context = report["contract"], report["context"]
+    return ReportRecord(
+        contract["function"],
+        tuple(contract["exceptions"]),
+        contract["source"]["module"],
+        contract["source"]["path"],
+        context["scope"],
+        context["line"],
+        context["column"],
+        tuple(
+            ExceptionRecord(
+                result["exception"], result["is_propagated"], result["is_handled"], result["level"]
+            )
+            for result in report["results"]
+        ),
+        contract.get("inferred", False),
+    )
+
+
+def load_json(text: str) -> List[ModuleRecord]:
+    """Inverse of ``build_json()``."""
+    return [
+        ModuleRecord(
+            module["source"]["module"],
+            module["source"]["path"],
+            tuple(_load_report(report) for report in module["reports"]),
+        )
+        for module in json.loads(text)
+    ]
+
+
+class NdjsonWriter:
+    """Write one JSON object per line and report, containing the ``source`` of the module and
+    the same fields as a report in ``build_json()``. Each module is flushed once written.
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, result: CheckResult):
+        """Write the records of all reports of a module."""
+        record = to_record(result)
+        source = _source(record)
+        for report in record.reports:
+            self.stream.write(json.dumps({"source": source, **_report(report)}))
+            self.stream.write("\n")
+        self.stream.flush()
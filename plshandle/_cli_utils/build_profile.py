@@ -0,0 +1,50 @@
+"""Build a report of the time and memory used per phase and the slowest modules."""
+
+import json
+
+from plshandle._cli import CLIResult
+
+
+TOP_MODULES = 10  #: number of slowest modules to report
+
+
+def _memory(peak_memory):
+    return "-" if peak_memory is None else "{:.1f}".format(peak_memory / 1024)
+
+
+def build_profile(output: CLIResult) -> str:
+    """Build a report from the profile of the CLI output, JSON if the output format is JSON."""
+    slowest = sorted(output.profile.modules.items(), key=lambda item: item[1], reverse=True)
+    slowest = slowest[:TOP_MODULES]
+
+    if output.config.output_format != "text":
+        return json.dumps(
+            {
+                "phases": [
+                    {
+                        "name": phase.name,
+                        "wall_time": phase.wall_time,
+                        "cpu_time": phase.cpu_time,
+                        "peak_memory": phase.peak_memory,
+                    }
+                    for phase in output.profile.phases
+                ],
+                "slowest_modules": [
+                    {"module": module, "time": duration} for module, duration in slowest
+                ],
+            }
+        )
+
+    lines = ["{:<20} {:>10} {:>10} {:>18}".format("phase", "wall [s]", "cpu [s]", "peak mem [MiB]")]
+    lines += [
+        "{:<20} {:>10.3f} {:>10.3f} {:>18}".format(
+            phase.name, phase.wall_time, phase.cpu_time, _memory(phase.peak_memory)
+        )
+        for phase in output.profile.phases
+    ]
+    if slowest:
+        lines.append("\nslowest modules:")
+        lines += [
+            "{:>10.1f} ms  {}".format(duration * 1000, module) for module, duration in slowest
+        ]
+    return "\n".join(lines)
@@ -16,19 +16,22 @@ def _get_unhandled(results, is_strict_mode):
 
 def collect_errors(output: CLIResult) -> Iterator[str]:
     """Collect the errors from the contract check results and yield corresponding error messages."""
-    for result, report, unhandled in [
-        (result, report, unhandled)
-        for result in output.results
-        for report in result.reports
+    for record, report, unhandled in [
+        (record, report, unhandled)
+        for record in output.records
+        for report in record.reports
         for unhandled in _get_unhandled(report.results, output.config.strict)
     ]:
         if unhandled.is_handled and output.config.strict and unhandled.level != 1:
             msg = "{path}:{line}: {exc} not handled at level 1"
         else:
-            msg = "{path}:{line}: Violated contract of {func}. Not handled nor propagated {exc}"
+            msg = (
+                "{path}:{line}: Violated {kind}contract of {func}. Not handled nor propagated {exc}"
+            )
         yield msg.format(
-            path=Path(result.source.path),
-            line=report.context.line,
-            func=report.contract.function.fullname,
-            exc=unhandled.exception.fullname,
+            path=Path(record.path),
+            line=report.line,
+            kind="inferred " if report.inferred else "",
+            func=report.function,
+            exc=unhandled.exception,
         )
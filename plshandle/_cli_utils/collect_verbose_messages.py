@@ -1,7 +1,7 @@
 """Collect verbose messages from CLI output."""
 
 import sys
-from typing import Iterable, Iterator
+from typing import Iterable, Iterator, Mapping
 
 from plshandle._cli import CLIResult
 
@@ -10,10 +10,17 @@ def _verbose_list(prefix: str, items: Iterable):
     return "{}:\n- {}\n".format(prefix, "\n- ".join([repr(item) for item in items]) or "<none>")
 
 
+def _verbose_mapping(prefix: str, items: Mapping):
+    return "{}:\n- {}\n".format(
+        prefix, "\n- ".join(["{}: {}".format(key, value) for key, value in items.items()]) or "<none>"
+    )
+
+
 def collect_verbose_messages(output: CLIResult) -> Iterator[str]:
     """Collect verbose messages from CLI output."""
     yield "CLI args merged with config: {}\n".format(output.config)
     yield _verbose_list("sys.path", sys.path)
     yield _verbose_list("collected modules", output.modules)
     yield _verbose_list("collected contracts", output.contracts)
-    yield _verbose_list("contract check results", output.results)
+    yield _verbose_list("contract check results", output.results or output.records)
+    yield _verbose_mapping("statistics", output.statistics)
@@ -1,7 +1,7 @@
 """Read config from ./pyproject.toml or --config and merge it with the other args."""
 
 from dataclasses import dataclass
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Tuple
 
 import toml
 
@@ -14,11 +14,28 @@ class Config:
     directory: Optional[Iterable[str]] = None
     package: Optional[Iterable[str]] = None
     module: Optional[Iterable[str]] = None
+    exclude: Optional[Iterable[str]] = None  #: skip modules and packages matching these patterns
+    include: Optional[Iterable[str]] = None  #: only keep modules matching these patterns
+    max_file_size: Optional[int] = None  #: skip modules larger than this many bytes
+    skip_generated: bool = False  #: skip modules marked as generated in their first lines
     strict: bool = False  #: try block + handlers must be one level above call
+    match_subclasses: bool = False  #: handling a base class of an exception handles it as well
+    infer: bool = False  #: infer contracts of functions letting exceptions of contracts escape
     json: bool = False  #: print checked contracts as JSON array to stdout
+    output_format: str = "text"  #: text, json (same as ``json``) or ndjson
+    output: Optional[str] = None  #: write JSON or NDJSON to this file instead of stdout
+    compact: bool = False  #: release the mypy build after checking, only keep records
+    single_pass: bool = False  #: collect and check contracts in one traversal of each module
     verbose: bool = False  #: verbose output
+    watch: bool = False  #: check again whenever files change, until interrupted
     version: bool = False
     help_requested: bool = False
+    changed_since: Optional[str] = None  #: only check modules affected by changes since git ref
+    changed_files: Optional[Iterable[str]] = None  #: only check modules affected by these files
+    shard: Optional[Tuple[int, int]] = None  #: only check the I-th of N shards of the modules
+    jobs: Optional[int] = None  #: number of processes checking modules, 0 = one per CPU
+    profile: bool = False  #: print time and memory used per phase and the slowest modules
+    profile_stats: Optional[str] = None  #: dump cProfile stats of the check phase to this file
 
 
 def _read_list(config: dict, key: dict, file: str):
@@ -41,6 +58,16 @@ def _read_bool(config: dict, key: dict, file: str, default=False):
         return default
 
 
+def _read_int(config: dict, key: dict, file: str, default=None):
+    try:
+        value = config[key]
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        raise TypeError("{}: '{}' must be an integer".format(file, key))
+    except KeyError:
+        return default
+
+
 def _read_from_file(file: str) -> Config:
     config = toml.load(file)
     try:
@@ -52,9 +79,16 @@ def _read_from_file(file: str) -> Config:
         directory=_read_list(config, "directories", file),
         package=_read_list(config, "packages", file),
         module=_read_list(config, "modules", file),
+        exclude=_read_list(config, "exclude", file),
+        include=_read_list(config, "include", file),
+        max_file_size=_read_int(config, "max_file_size", file),
+        skip_generated=_read_bool(config, "skip_generated", file),
         strict=_read_bool(config, "strict", file),
+        match_subclasses=_read_bool(config, "match_subclasses", file),
+        infer=_read_bool(config, "infer", file),
         json=_read_bool(config, "json", file),
         verbose=_read_bool(config, "verbose", file),
+        jobs=_read_int(config, "jobs", file),
     )
 
 
@@ -74,7 +108,27 @@ def read_and_merge_config(cli_args: Config) -> Config:
         directory=(cfg_args.directory or []) + (cli_args.directory or []),
         package=(cfg_args.package or []) + (cli_args.package or []),
         module=(cfg_args.module or []) + (cli_args.module or []),
+        exclude=(cfg_args.exclude or []) + (cli_args.exclude or []),
+        include=(cfg_args.include or []) + (cli_args.include or []),
+        max_file_size=(
+            cli_args.max_file_size if cli_args.max_file_size is not None else cfg_args.max_file_size
+        ),
+        skip_generated=cfg_args.skip_generated or cli_args.skip_generated,
         strict=cfg_args.strict or cli_args.strict,
+        match_subclasses=cfg_args.match_subclasses or cli_args.match_subclasses,
+        infer=cfg_args.infer or cli_args.infer,
         json=cfg_args.json or cli_args.json,
+        output_format=cli_args.output_format
+        or ("json" if cfg_args.json or cli_args.json else "text"),
+        output=cli_args.output,
+        compact=cli_args.compact,
+        single_pass=cli_args.single_pass,
         verbose=cfg_args.verbose or cli_args.verbose,
+        watch=cli_args.watch,
+        changed_since=cli_args.changed_since,
+        changed_files=cli_args.changed_files,
+        shard=cli_args.shard,
+        jobs=cli_args.jobs if cli_args.jobs is not None else cfg_args.jobs,
+        profile=cli_args.profile,
+        profile_stats=cli_args.profile_stats,
     )
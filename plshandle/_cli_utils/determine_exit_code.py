@@ -1,25 +1,36 @@
 """Determine the exit code from CLI arguments and check results."""
 
+from typing import Sequence
+
 from plshandle._cli import CLIResult
 from plshandle._cli_utils.collect_errors import _get_unhandled
+from plshandle._cli_utils.config import Config
+from plshandle._records import ModuleRecord
 
 
-def determine_exit_code(output: CLIResult):
-    """Determine the exit code from CLI arguments and check results."""
-    if output.config.help_requested:
+def exit_code(config: Config, modules: bool, contracts: bool, records: Sequence[ModuleRecord]):
+    """Determine the exit code from CLI arguments, whether any modules and contracts were found
+    and the check results.
+    """
+    if config.help_requested:
         return 20
-    if output.config.version:
+    if config.version:
         return 21
-    if not output.modules:
+    if not modules:
         return 10
-    if not output.contracts:
+    if not contracts:
         return 11
-    if not any(result.reports for result in output.results):
+    if not any(record.reports for record in records):
         return 12
     if any(
-        _get_unhandled(report.results, output.config.strict)
-        for result in output.results
-        for report in result.reports
+        _get_unhandled(report.results, config.strict)
+        for record in records
+        for report in record.reports
     ):
         return 1
     return 0
+
+
+def determine_exit_code(output: CLIResult):
+    """Determine the exit code from CLI arguments and check results."""
+    return exit_code(output.config, bool(output.modules), bool(output.contracts), output.records)
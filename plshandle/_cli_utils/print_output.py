@@ -0,0 +1,44 @@
+"""Print the CLI output the same way ``python -m plshandle`` does."""
+
+from typing import TextIO
+
+from plshandle._cli import CLIResult
+from plshandle._cli_utils.build_json import build_json
+from plshandle._cli_utils.build_profile import build_profile
+from plshandle._cli_utils.build_version import build_version
+from plshandle._cli_utils.collect_errors import collect_errors
+from plshandle._cli_utils.collect_verbose_messages import collect_verbose_messages
+from plshandle._cli_utils.determine_exit_code import determine_exit_code
+
+
+def print_output(cli_output: CLIResult, stdout: TextIO, stderr: TextIO) -> int:
+    """Print verbose messages, JSON and errors of the CLI output. Returns the exit code."""
+    if cli_output.config.verbose:
+        for msg in collect_verbose_messages(cli_output):
+            print(msg, file=stdout)
+
+    if cli_output.config.version:
+        print(build_version(), file=stdout)
+    elif cli_output.config.help_requested:
+        pass  # prevent printing the rest if help was requested
+    elif not cli_output.modules:
+        print("error: No modules found", file=stderr)
+    elif not cli_output.contracts:
+        print("error: No contracts found", file=stderr)
+    elif not any(record.reports for record in cli_output.records):
+        print("error: No contracts checked", file=stderr)
+
+    if cli_output.config.output_format == "json":
+        if cli_output.config.output:
+            with open(cli_output.config.output, "w") as file:
+                print(build_json(cli_output.records), file=file)
+        else:
+            print(build_json(cli_output.records), file=stdout)
+
+    for msg in collect_errors(cli_output):
+        print(msg, file=stderr)
+
+    if cli_output.config.profile and cli_output.profile:
+        print(build_profile(cli_output), file=stderr)
+
+    return determine_exit_code(cli_output)
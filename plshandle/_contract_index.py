@@ -0,0 +1,35 @@
+"""Index contracts by the function defining them."""
+
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from mypy.nodes import FuncDef
+
+from plshandle._visitors.contract_collector import Contract
+
+
+class ContractIndex:
+    """Map the fullname of each function to the contracts it defines, so the contracts of a called
+    function can be looked up without scanning all contracts.
+    """
+
+    def __init__(self, contracts: Iterable[Contract]):
+        self._contracts: Dict[str, List[Contract]] = {}
+        for contract in contracts:
+            self._contracts.setdefault(contract.function.fullname, []).append(contract)
+
+    def __len__(self):
+        return sum(len(contracts) for contracts in self._contracts.values())
+
+    def __bool__(self):
+        return bool(self._contracts)
+
+    def get(self, fullname: str) -> Sequence[Contract]:
+        """Get the contracts defined by the function with the given fullname."""
+        return self._contracts.get(fullname, ())
+
+    def lookup(self, functions: Iterable[FuncDef]) -> Iterator[Contract]:
+        """Yield the contracts defined by any of the given functions. Each function is looked up
+        only once, even if passed multiple times (e.g. if resolved from an union type).
+        """
+        for name in dict.fromkeys(function.fullname for function in functions):
+            yield from self._contracts.get(name, ())
@@ -0,0 +1,152 @@
+"""Persist collected contracts and other per-module data next to mypy's cache."""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from mypy.build import PRI_INDIRECT
+from mypy.lookup import lookup_fully_qualified
+from mypy.modulefinder import BuildSource
+from mypy.nodes import Decorator, FuncDef, TypeInfo
+from mypy.options import Options
+
+from plshandle._cache import MypyCache
+
+
+_VERSION = 1
+
+
+def _module_hash(module: str, cache: MypyCache) -> str:
+    # contracts depend on the module itself and on the interface of everything it imports, e.g.
+    # aliased exception types or aliases of the decorator. Indirect dependencies are added by mypy
+    # while type checking and differ depending on which modules were loaded from its cache.
+    state = cache.build.graph[module]
+    digest = hashlib.sha256(state.source_hash.encode())
+    for dependency in sorted(state.dependencies):
+        if state.priorities.get(dependency, PRI_INDIRECT) != PRI_INDIRECT:
+            digest.update(
+                "{}:{}".format(dependency, cache.build.graph[dependency].interface_hash).encode()
+            )
+    return digest.hexdigest()
+
+
+def lookup_node(fullname: str, cache: MypyCache):
+    """Look up a node by its fullname in the build, returns ``None`` if not found."""
+    symbol = lookup_fully_qualified(fullname, cache.build.files)
+    return symbol.node if symbol else None
+
+
+class JsonStore:
+    """Versioned JSON file holding one entry per module. The store is disabled if ``path`` is
+    ``None``.
+    """
+
+    filename = "store.json"
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._modules: Dict[str, dict] = self._read()
+
+    @classmethod
+    def from_options(cls, options: Options):
+        """Create a store located in mypy's cache directory. The store is disabled if mypy does
+        not write its cache either.
+        """
+        if not options.incremental or options.cache_dir == os.devnull:
+            return cls(None)
+        return cls(os.path.join(options.cache_dir, "plshandle", cls.filename))
+
+    def _read(self) -> Dict[str, dict]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}  # o.k., first run or corrupt, start from scratch
+        return data["modules"] if data.get("version") == _VERSION else {}
+
+    def _get(self, source: BuildSource, cache: MypyCache) -> Optional[dict]:
+        # get the entry of an unchanged module, counts misses
+        if not self.path:
+            return None
+        entry = self._modules.get(source.module)
+        if entry is None or entry["hash"] != _module_hash(source.module, cache):
+            self.misses += 1
+            return None
+        return entry
+
+    def _set(self, source: BuildSource, cache: MypyCache, **entry):
+        if self.path:
+            self._modules[source.module] = {
+                "path": source.path,
+                "hash": _module_hash(source.module, cache),
+                **entry,
+            }
+
+    def save(self):
+        """Write the store to disk."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(temp_path, "w") as file:
+            json.dump({"version": _VERSION, "modules": self._modules}, file)
+        os.replace(temp_path, self.path)
+
+
+class ContractStore(JsonStore):
+    """Store the contracts defined per module on disk. An entry is only reused if neither the
+    module nor the interface of its dependencies changed.
+    """
+
+    filename = "contracts.json"
+
+    def load(
+        self, source: BuildSource, cache: MypyCache
+    ) -> Optional[List[Tuple[FuncDef, Tuple[TypeInfo, ...]]]]:
+        """Load the functions and exception types of all contracts of the given module. Returns
+        ``None`` if the module changed or if not all functions and exception types could be found
+        in the current build.
+        """
+        entry = self._get(source, cache)
+        if entry is None:
+            return None
+
+        contracts = []
+        for contract in entry["contracts"]:
+            function = lookup_node(contract["function"], cache)
+            if isinstance(function, Decorator):
+                function = function.func
+            types = [lookup_node(name, cache) for name in contract["exceptions"]]
+            if not isinstance(function, FuncDef) or not all(
+                isinstance(type_, TypeInfo) for type_ in types
+            ):
+                self.misses += 1  # pragma: no cover
+                return None  # pragma: no cover, e.g. nested functions are not fully qualified
+            contracts.append((function, tuple(types)))
+
+        self.hits += 1
+        return contracts
+
+    def store(
+        self,
+        source: BuildSource,
+        cache: MypyCache,
+        contracts: Iterable[Tuple[FuncDef, Iterable[TypeInfo]]],
+    ):
+        """Remember the functions and exception types of the contracts of the given module."""
+        self._set(
+            source,
+            cache,
+            contracts=[
+                {
+                    "function": function.fullname,
+                    "exceptions": [type_.fullname for type_ in exception_types],
+                }
+                for function, exception_types in contracts
+            ],
+        )
@@ -0,0 +1,191 @@
+"""Long-running daemon keeping the mypy build, contracts and check results in memory."""
+
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+import traceback
+from typing import Callable, Optional, Sequence
+
+from mypy.options import Options
+
+from plshandle._cli import CLIResult, _parse_config, _streamed_output
+from plshandle._cli_utils.print_output import print_output
+from plshandle._session import Session
+
+
+DEFAULT_SOCKET = os.path.join(".mypy_cache", "plshandle", "daemon.sock")
+NOT_RUNNING = 30  #: exit code of the client if the daemon is not running
+
+
+class Workspace:
+    """Session checking the modules given by CLI arguments, see ``Session``."""
+
+    def __init__(self, mypy_options: Callable[[], Options] = Options):
+        self.session = Session(mypy_options)
+
+    def check(self, args: Sequence[str]) -> CLIResult:
+        """Same as ``plshandle.cli()``, but reuses everything not affected by changes."""
+        config = _parse_config(args)
+        if config.version or config.help_requested:  # pragma: no cover
+            return CLIResult(config, [], [], [])
+
+        output = self.session.check_config(config)
+        with _streamed_output(config) as on_result:
+            for result in output.results if on_result else ():
+                on_result(result)
+        return output
+
+
+def _run_check(workspace: Workspace, args: Sequence[str]) -> dict:
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            exit_code = print_output(workspace.check(args), stdout, stderr)
+        except Exception:  # pylint: disable=broad-except  # pragma: no cover
+            traceback.print_exc()  # same as an uncaught exception in python -m plshandle
+            exit_code = 1
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline().decode())
+        response = self.server.dispatch(request)  # type: ignore
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _Server(socketserver.UnixStreamServer):
+    def __init__(self, path: str, workspace: Workspace):
+        super().__init__(path, _Handler)
+        self.workspace = workspace
+        self.running = True
+        self.started = time.time()
+
+    def dispatch(self, request: dict) -> dict:
+        command = request.get("command")
+        if command == "check":
+            return _run_check(self.workspace, request["args"])
+        if command == "status":
+            return {"pid": os.getpid(), "uptime": time.time() - self.started}
+        if command == "stop":
+            self.running = False
+            return {"pid": os.getpid()}
+        return {"error": "unknown command '{}'".format(command)}  # pragma: no cover
+
+
+def request(path: str, payload: dict) -> dict:
+    """Send a request to the daemon listening on ``path`` and return its response. Raises
+    ``OSError`` if the daemon is not running.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as file:
+            return json.loads(file.readline().decode())
+
+
+def _is_running(path: str) -> bool:
+    try:
+        request(path, {"command": "status"})
+        return True
+    except OSError:
+        return False
+
+
+def serve(path: str = DEFAULT_SOCKET, workspace: Optional[Workspace] = None):
+    """Serve requests on the Unix socket at ``path`` until a stop request is received."""
+    if _is_running(path):
+        raise RuntimeError("plshandle daemon is already listening on {}".format(path))
+    if os.path.exists(path):  # pragma: no cover
+        os.remove(path)  # left over by a daemon that was killed
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with _Server(path, workspace or Workspace()) as server:
+        try:
+            while server.running:
+                server.handle_request()
+        finally:
+            os.remove(path)
+
+
+def _start(path: str, timeout: float) -> int:  # pragma: no cover, spawns a process
+    if _is_running(path):
+        print("plshandle daemon is already running")
+        return 0
+    subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", "plshandle", "daemon", "--socket", path, "run"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if _is_running(path):
+            print("plshandle daemon started")
+            return 0
+        time.sleep(0.1)
+    print("error: plshandle daemon did not start within {}s".format(timeout), file=sys.stderr)
+    return 1
+
+
+def _send(path: str, payload: dict) -> Optional[dict]:
+    try:
+        return request(path, payload)
+    except OSError:
+        print("error: plshandle daemon is not running", file=sys.stderr)
+        return None
+
+
+def daemon_main(argv: Sequence[str]) -> int:
+    """Entry point of ``python -m plshandle daemon``. Returns the exit code."""
+    parser = ArgumentParser(
+        prog="python -m plshandle daemon",
+        description="Keep the mypy build, contracts and check results in memory and only process "
+        "changed files on subsequent checks.",
+    )
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="(default: %(default)s)")
+    commands = parser.add_subparsers(dest="command")
+    start = commands.add_parser("start", help="start the daemon in the background")
+    start.add_argument("--timeout", type=float, default=30.0)
+    commands.add_parser("run", help="run the daemon in the foreground")
+    commands.add_parser("stop", help="stop the daemon")
+    commands.add_parser("status", help="check whether the daemon is running")
+    # the arguments of check are passed on as they are, including -h
+    commands.add_parser(
+        "check", help="check contracts, accepts the usual arguments", add_help=False
+    )
+    args, unknown = parser.parse_known_args(argv)
+    if unknown and args.command != "check":  # pragma: no cover
+        parser.error("unrecognized arguments: {}".format(" ".join(unknown)))
+
+    if args.command == "start":  # pragma: no cover
+        return _start(args.socket, args.timeout)
+    if args.command == "run":  # pragma: no cover
+        serve(args.socket)
+        return 0
+    if args.command in ("stop", "status"):
+        response = _send(args.socket, {"command": args.command})
+        if response is None:
+            return NOT_RUNNING
+        state = "stopped" if args.command == "stop" else "running"
+        print("plshandle daemon {} (pid {})".format(state, response["pid"]))
+        return 0
+    if args.command == "check":
+        check_args = list(argv[list(argv).index("check") + 1 :])
+        response = _send(args.socket, {"command": "check", "args": check_args})
+        if response is None:  # pragma: no cover
+            return NOT_RUNNING
+        sys.stdout.write(response["stdout"])
+        sys.stderr.write(response["stderr"])
+        return response["exit_code"]
+
+    parser.print_help()  # pragma: no cover
+    return 20  # pragma: no cover
@@ -1,18 +1,21 @@
 """Decorator used to mark contracts."""
 
-from typing import Type
+from typing import Callable, Type, TypeVar
+
+
+_Function = TypeVar("_Function")  # functions, but also e.g. classmethod objects
 
 
 def _unused(*_, **__):
     pass
 
 
-def plshandle(*exception_types: Type[BaseException]):
+def plshandle(*exception_types: Type[BaseException]) -> Callable[[_Function], _Function]:
     """Require the caller to handle the given ``exception_types``. This decorator does not modify
     the original function."""
     _unused(exception_types)
 
-    def decorator(function):
+    def decorator(function: _Function) -> _Function:
         return function
 
     return decorator
@@ -1,15 +1,205 @@
 """Gather modules from directories and packages."""
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from importlib.machinery import SOURCE_SUFFIXES
 from importlib.util import find_spec
+import os
 from pathlib import Path
-import pkgutil
-from typing import Iterable, Iterator, List, Optional
-
-import setuptools
+import threading
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 from mypy.modulefinder import BuildSource
 
 
+class Listing(NamedTuple):
+    """Entries of a directory relevant for gathering modules."""
+
+    directories: Tuple[str, ...]  #: names of the subdirectories, in the order of ``os.scandir``
+    modules: Tuple[Tuple[str, str], ...]  #: name and file name of each module, by file name
+
+
+def _module_name(file_name: str) -> Optional[str]:
+    for suffix in SOURCE_SUFFIXES:
+        if file_name.endswith(suffix):
+            name = file_name[: -len(suffix)]
+            return name if name and "." not in name and name != "__init__" else None
+    return None
+
+
+def _is_package(directory: str) -> bool:
+    return any(os.path.isfile(os.path.join(directory, "__init__" + s)) for s in SOURCE_SUFFIXES)
+
+
+def _scan(directory: str) -> Listing:
+    directories: List[str] = []
+    files: List[str] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                directories.append(entry.name)
+            elif entry.is_file():
+                files.append(entry.name)
+    modules: Dict[str, str] = {}
+    for file_name in sorted(files):
+        name = _module_name(file_name)
+        if name and name not in modules:
+            modules[name] = file_name
+    # a package shadows a module of the same name
+    for name in set(modules).intersection(directories):
+        if _is_package(os.path.join(directory, name)):
+            del modules[name]
+    return Listing(tuple(directories), tuple(modules.items()))
+
+
+class DirectoryCache:
+    """Listings of directories, reused as long as the modification time of a directory does not
+    change, which is the case whenever an entry is added to, removed from or renamed in it.
+    """
+
+    def __init__(self):
+        self._listings: Dict[str, Tuple[int, Listing]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def list(self, directory: str) -> Listing:
+        """Get the listing of ``directory``, scanning it if it is not cached or changed."""
+        mtime = os.stat(directory).st_mtime_ns
+        cached = self._listings.get(directory)
+        if cached and cached[0] == mtime:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        listing = _scan(directory)
+        self._listings[directory] = (mtime, listing)
+        return listing
+
+
+#: markers in the first lines of generated files, e.g. of protobuf modules
+GENERATED_MARKERS = (b"@generated", b"DO NOT EDIT", b"Generated by the protocol buffer compiler")
+_HEADER_SIZE = 1024
+
+
+class ModuleFilter:
+    """Rules excluding modules while they are gathered, before mypy reads them. Patterns are
+    matched against the path of a module or package relative to the directory it was found in,
+    which is the module name with slashes, e.g. ``tests/*`` or ``*_pb2.py``. A package matching
+    an ``exclude`` pattern is not scanned at all. With ``include`` patterns, only modules matching
+    one of them are kept. Modules larger than ``max_file_size`` bytes or containing one of the
+    ``GENERATED_MARKERS`` in their first kilobyte (with ``skip_generated``) are skipped as well.
+    Modules passed by name are never skipped. ``skipped`` counts the skipped modules and packages
+    per reason.
+    """
+
+    def __init__(
+        self,
+        exclude: Sequence[str] = (),
+        include: Sequence[str] = (),
+        max_file_size: Optional[int] = None,
+        skip_generated: bool = False,
+    ):
+        self.exclude = tuple(exclude)
+        self.include = tuple(include)
+        self.max_file_size = max_file_size
+        self.skip_generated = skip_generated
+        self.skipped: Counter = Counter()
+        self._lock = threading.Lock()  # directories are scanned concurrently
+
+    def _skip(self, reason: str) -> bool:
+        with self._lock:
+            self.skipped[reason] += 1
+        return False
+
+    def keeps_package(self, package: str) -> bool:
+        """Whether to scan the package with the given name."""
+        path = package.replace(".", "/")
+        if any(fnmatchcase(path, pattern) for pattern in self.exclude):
+            return self._skip("excluded packages")
+        return True
+
+    def keeps_module(self, module: str, path: str) -> bool:
+        """Whether to keep the module with the given name and file path."""
+        relative = module.replace(".", "/") + os.path.splitext(path)[1]
+        if any(fnmatchcase(relative, pattern) for pattern in self.exclude):
+            return self._skip("excluded modules")
+        if self.include and not any(fnmatchcase(relative, pattern) for pattern in self.include):
+            return self._skip("excluded modules")
+        if self.max_file_size is not None and os.path.getsize(path) > self.max_file_size:
+            return self._skip("large modules")
+        if self.skip_generated and _is_generated(path):
+            return self._skip("generated modules")
+        return True
+
+
+def _is_generated(path: str) -> bool:
+    with open(path, "rb") as file:
+        header = file.read(_HEADER_SIZE)
+    return any(marker in header for marker in GENERATED_MARKERS)
+
+
+def _is_excluded(package: str) -> bool:
+    # same as setuptools.find_namespace_packages()
+    return package == "ez_setup" or package.endswith("__pycache__")
+
+
+def _find_packages(
+    directory: str, cache: DirectoryCache, module_filter: ModuleFilter
+) -> Iterator[Tuple[str, str]]:
+    # yield the name and location of all packages in the directory in the same order as
+    # setuptools.find_namespace_packages(), that is all subdirectories without a dot in their name
+    pending = [(directory, "")]
+    while pending:
+        parent, prefix = pending.pop()
+        children = []
+        for name in cache.list(parent).directories:
+            if "." in name:
+                continue
+            package, location = prefix + name, os.path.join(parent, name)
+            if not module_filter.keeps_package(package):
+                continue
+            if not _is_excluded(package):
+                yield package, location
+            children.append((location, package + "."))
+        pending.extend(reversed(children))
+
+
+def _gather_modules_in_directory(
+    directory: str, cache: DirectoryCache, module_filter: ModuleFilter
+) -> Tuple[List[BuildSource], List[str]]:
+    modules: List[BuildSource] = []
+    package_roots: List[str] = []
+    if not os.path.isdir(directory):
+        return modules, package_roots  # like os.walk(), there is nothing to find
+    for package, location in _find_packages(os.path.abspath(directory), cache, module_filter):
+        package_roots.append(location)
+        for name, file_name in cache.list(location).modules:
+            module, path = "{}.{}".format(package, name), os.path.join(location, file_name)
+            if module_filter.keeps_module(module, path):
+                modules.append(BuildSource(path, module, None))
+    return modules, package_roots
+
+
+def _gather_modules_in_directories(
+    directories: Sequence[str],
+    package_roots: List[str],
+    cache: DirectoryCache,
+    module_filter: ModuleFilter,
+) -> Iterator[BuildSource]:
+    # directories are independent of each other, scan them concurrently
+    def gather(directory: str):
+        return _gather_modules_in_directory(directory, cache, module_filter)
+
+    if len(directories) > 1:
+        with ThreadPoolExecutor(min(len(directories), os.cpu_count() or 1)) as executor:
+            gathered = list(executor.map(gather, directories))
+    else:
+        gathered = [gather(directory) for directory in directories]
+    for modules, roots in gathered:
+        package_roots.extend(roots)
+        yield from modules
+
+
 def _find_package_dirs(package: str):
     spec = find_spec(package)
     if not spec or not spec.submodule_search_locations:
@@ -17,13 +207,24 @@ def _find_package_dirs(package: str):
     return spec.submodule_search_locations
 
 
-def _gather_modules_in(packages: Iterable[str], package_roots: List[str]) -> Iterator[str]:
+def _gather_modules_in_packages(
+    packages: Iterable[str],
+    package_roots: List[str],
+    cache: DirectoryCache,
+    module_filter: ModuleFilter,
+) -> Iterator[BuildSource]:
     for package in packages:
         dirs = _find_package_dirs(package)
         package_roots.extend(dirs)
-        for module_info in pkgutil.iter_modules([Path(x).as_posix() for x in dirs]):
-            if not module_info.ispkg:
-                yield "{}.{}".format(package, module_info.name)
+        seen = set()
+        for directory in dirs:
+            for name, file_name in cache.list(directory).modules:
+                if name in seen:
+                    continue
+                seen.add(name)
+                module, path = "{}.{}".format(package, name), os.path.join(directory, file_name)
+                if module_filter.keeps_module(module, path):
+                    yield BuildSource(path, module, None)
 
 
 def _is_valid_origin(origin: Optional[str]):
@@ -44,12 +245,18 @@ def gather_modules(
     packages: Iterable[str],
     modules: Iterable[str],
     package_roots: List[str],
+    cache: Optional[DirectoryCache] = None,
+    module_filter: Optional[ModuleFilter] = None,
 ):
-    """Gather modules from directories and packages."""
-    all_packages = list(packages)
-    for directory in directories:
-        native_dir = str(Path(directory))
-        all_packages.extend(setuptools.find_namespace_packages(native_dir))
-
-    yield from _gather_module_infos(_gather_modules_in(all_packages, package_roots))
+    """Gather modules from directories and packages. Directories are scanned without importing
+    anything, the module names are derived from the paths. Only packages and modules need to be
+    found on ``sys.path``. Listings of directories are taken from the optional ``cache``, modules
+    of directories and packages are skipped according to the optional ``module_filter``.
+    """
+    cache = cache or DirectoryCache()
+    module_filter = module_filter or ModuleFilter()
+    yield from _gather_modules_in_packages(packages, package_roots, cache, module_filter)
+    yield from _gather_modules_in_directories(
+        [str(Path(directory)) for directory in directories], package_roots, cache, module_filter
+    )
     yield from _gather_module_infos(modules)
@@ -0,0 +1,199 @@
+"""Infer the contracts of functions letting exceptions of called contracts escape."""
+
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set
+
+from mypy.modulefinder import BuildSource
+from mypy.nodes import FuncDef, TypeInfo
+
+from plshandle._cache import MypyCache
+from plshandle._visitors.call_graph import CallGraphBuilder, Calls
+from plshandle._visitors.contract_collector import Contract
+
+
+_NONE: FrozenSet[TypeInfo] = frozenset()
+
+
+def strongly_connected_components(
+    graph: Dict[FuncDef, Sequence[FuncDef]]
+) -> Iterator[List[FuncDef]]:
+    """Yield the strongly connected components of ``graph``, which maps each function to the
+    functions it calls. A component is yielded after all components it calls (Tarjan's algorithm,
+    without recursion since call chains can be arbitrarily deep).
+    """
+    index: Dict[FuncDef, int] = {}
+    low: Dict[FuncDef, int] = {}
+    stack: List[FuncDef] = []
+    on_stack: Set[FuncDef] = set()
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    caller = work[-1][0]
+                    low[caller] = min(low[caller], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member is node:
+                            break
+                    yield component
+
+
+class ContractInference:
+    """Infer the exception types each function without a contract lets escape: the types of the
+    contracts it calls (and of the functions it calls which let them escape in turn) that are not
+    handled by a try statement within the function. The types are propagated along the call graph
+    one strongly connected component at a time, callees first, iterating within a component until
+    nothing changes. The call graph and the inferred types are kept between calls to ``infer()``,
+    so only the modules passed as ``affected`` are traversed again and only the components defined
+    in them or calling a function whose types changed are recomputed. With ``match_subclasses``,
+    handling a base class of an exception handles it as well.
+    """
+
+    def __init__(self, match_subclasses: bool = False):
+        self.match_subclasses = match_subclasses
+        self.recomputed = 0  #: components recomputed by the last call to ``infer()``
+        self.reused = 0  #: components reused by the last call to ``infer()``
+        self._calls: Dict[str, Dict[FuncDef, Calls]] = {}
+        self._types: Dict[FuncDef, FrozenSet[TypeInfo]] = {}  # non-empty only
+        self._contracts: Dict[str, FrozenSet[TypeInfo]] = {}  # types of contracts by fullname
+
+    def infer(
+        self,
+        contracts: Iterable[Contract],
+        sources: Sequence[BuildSource],
+        cache: MypyCache,
+        affected: Optional[Set[str]] = None,
+    ) -> List[Contract]:
+        """Infer the contracts of the functions defined in ``sources``, which must contain all
+        modules that may call contracts. Only the ``affected`` modules (default: all) and modules
+        not seen by the last call are traversed. Returns the inferred contracts, marked as such.
+        """
+        modules = {source.module for source in sources}
+        stale: Set[FuncDef] = set()
+        for module in list(self._calls):
+            if module not in modules or affected is None or module in affected:
+                stale.update(self._calls.pop(module))
+        builder = CallGraphBuilder(sources, cache, self._calls)
+        dirty: Set[FuncDef] = set()
+        for calls in builder.calls.values():
+            dirty.update(calls)
+        self._calls.update(builder.calls)
+        removed = stale - dirty
+        for function in removed:
+            self._types.pop(function, None)
+
+        previous = self._contracts
+        self._contracts = {}
+        for contract in contracts:
+            if not contract.inferred:
+                name = contract.function.fullname
+                types = self._contracts.get(name, _NONE)
+                self._contracts[name] = types.union(contract.exception_types)
+        changed = set(self._contracts.keys() ^ previous.keys())
+        changed.update(
+            name
+            for name, types in self._contracts.items()
+            if name in previous and previous[name] != types
+        )
+        self._propagate(dirty, removed, changed)
+
+        return [
+            Contract(
+                source,
+                function,
+                tuple(sorted(self._types[function], key=lambda type_: type_.fullname)),
+                inferred=True,
+            )
+            for source in sources
+            for function in self._calls.get(source.module, ())
+            if function in self._types
+        ]
+
+    def _propagate(self, dirty: Set[FuncDef], removed: Set[FuncDef], changed_contracts: Set[str]):
+        calls = {
+            function: function_calls
+            for module_calls in self._calls.values()
+            for function, function_calls in module_calls.items()
+            if function.fullname not in self._contracts
+        }
+        graph = {
+            function: list(
+                dict.fromkeys(callee for callees in function_calls.values() for callee in callees)
+            )
+            for function, function_calls in calls.items()
+        }
+        changed = set(removed)  # functions whose types changed
+        self.recomputed = self.reused = 0
+        successors = {
+            function: [callee for callee in callees if callee in graph]
+            for function, callees in graph.items()
+        }
+        for component in strongly_connected_components(successors):
+            if not any(
+                callee in changed or callee.fullname in changed_contracts
+                for function in component
+                for callee in graph[function]
+            ) and not any(function in dirty for function in component):
+                self.reused += 1
+                continue
+            self.recomputed += 1
+            previous = {function: self._types.pop(function, _NONE) for function in component}
+            self._solve(component, calls, graph)
+            changed.update(
+                function
+                for function in component
+                if self._types.get(function, _NONE) != previous[function]
+            )
+
+    def _solve(
+        self,
+        component: List[FuncDef],
+        calls: Dict[FuncDef, Calls],
+        graph: Dict[FuncDef, List[FuncDef]],
+    ):
+        # start from nothing escaping and iterate until nothing changes, a single function not
+        # calling itself is done after one pass
+        recursive = len(component) > 1 or component[0] in graph[component[0]]
+        updated = True
+        while updated:
+            updated = False
+            for function in component:
+                types = self._escaping(calls[function])
+                if types != self._types.get(function, _NONE):
+                    self._types[function] = types
+                    updated = recursive
+
+    def _escaping(self, calls: Calls) -> FrozenSet[TypeInfo]:
+        escaping: Set[TypeInfo] = set()
+        for handled, callees in calls.items():
+            for callee in callees:
+                types = self._contracts.get(callee.fullname) or self._types.get(callee, _NONE)
+                escaping.update(
+                    type_ for type_ in types if not handled or not self._is_handled(type_, handled)
+                )
+        return frozenset(escaping)
+
+    def _is_handled(self, type_: TypeInfo, handled: FrozenSet[TypeInfo]) -> bool:
+        if self.match_subclasses:
+            return any(base in handled for base in type_.mro)
+        return type_ in handled
@@ -0,0 +1,59 @@
+"""Merge the JSON outputs of several shards (``--shard``) into one report."""
+
+from argparse import ArgumentParser
+import sys
+from typing import Dict, List, Sequence
+
+from plshandle._cli import CLIResult
+from plshandle._cli_utils.build_json import build_json, load_json
+from plshandle._cli_utils.collect_errors import collect_errors
+from plshandle._cli_utils.config import Config
+from plshandle._cli_utils.determine_exit_code import exit_code
+from plshandle._records import ModuleRecord
+
+
+def merge(files: Sequence[str]) -> List[ModuleRecord]:
+    """Concatenate the records of all files in the given order. A module contained in several
+    files is only taken from the first one.
+    """
+    records: Dict[str, ModuleRecord] = {}
+    for file in files:
+        with open(file) as stream:
+            for record in load_json(stream.read()):
+                records.setdefault(record.module, record)
+    return list(records.values())
+
+
+def merge_main(argv: Sequence[str]) -> int:
+    """Entry point of ``python -m plshandle merge``. Prints the errors of the merged results and
+    returns the exit code ``python -m plshandle`` would return for all shards in one run.
+    """
+    parser = ArgumentParser(
+        prog="python -m plshandle merge",
+        description="Merge the JSON outputs of all shards of a run into one report.",
+    )
+    parser.add_argument("files", nargs="+", metavar="FILE", help="JSON output of a shard")
+    parser.add_argument("--strict", action="store_true", help="same as for the shards")
+    parser.add_argument(
+        "--json", action="store_true", help="prints the merged JSON array to stdout"
+    )
+    parser.add_argument("--output", metavar="FILE", help="write the merged JSON array to this file")
+    args = parser.parse_args(argv)
+
+    config = Config(strict=args.strict)
+    records = merge(args.files)
+    if args.output:
+        with open(args.output, "w") as file:
+            print(build_json(records), file=file)
+    elif args.json:
+        print(build_json(records))
+
+    # shards only output results if contracts were found, so there are no records without them
+    if not records:
+        print("error: No modules or contracts found", file=sys.stderr)
+    elif not any(record.reports for record in records):
+        print("error: No contracts checked", file=sys.stderr)
+    for msg in collect_errors(CLIResult(config, [], [], [], records=records)):
+        print(msg, file=sys.stderr)
+
+    return exit_code(config, bool(records), bool(records), records)
@@ -0,0 +1,103 @@
+"""Check modules in parallel using forked worker processes."""
+
+import multiprocessing
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from mypy.modulefinder import BuildSource
+
+from plshandle._cache import MypyCache
+from plshandle._contract_index import ContractIndex
+from plshandle._ast_utils.resolve_called_functions import MethodCache
+from plshandle._result_store import dump_reports, load_reports
+from plshandle._visitors.contract_checker import CheckResult, ContractChecker, HandlerCache
+from plshandle._visitors.contract_collector import Contract
+
+
+# state of the parent process, inherited by the forked workers since the build cannot be sent to
+# them efficiently
+_STATE: Optional[Tuple[Sequence[Contract], Sequence[BuildSource], MypyCache, bool]] = None
+
+
+def _check_chunk(chunk: Tuple[int, int]) -> tuple:  # pragma: no cover
+    # runs in a worker, the results refer to nodes by name and are looked up by the parent
+    contracts, sources, cache, match_subclasses = _STATE  # type: ignore
+    start, stop = chunk
+    checker = ContractChecker(
+        contracts, sources[start:stop], cache, sources[:start], match_subclasses=match_subclasses
+    )
+    return (
+        [dump_reports(result) for result in checker.results],
+        checker.handler_cache.hits,
+        checker.handler_cache.misses,
+        checker.method_cache.hits,
+        checker.method_cache.misses,
+        checker.durations,
+    )
+
+
+def _chunks(count: int, jobs: int) -> List[Tuple[int, int]]:
+    # contiguous chunks, several per job to balance modules of different sizes
+    size = max(1, -(-count // (jobs * 4)))
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Number of worker processes to use, ``0`` means one per CPU. Returns ``1`` if processes
+    cannot be forked on this platform.
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return 1  # pragma: no cover, e.g. Windows
+    return jobs or os.cpu_count() or 1
+
+
+class ParallelChecker:
+    """Same as ``ContractChecker``, but checks the modules in ``jobs`` forked processes. The
+    results are in the order of ``sources``, no matter which process checked them, and are passed
+    to ``on_result`` as soon as the chunk containing them is done.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        contracts: Sequence[Contract],
+        sources: Sequence[BuildSource],
+        cache: MypyCache,
+        jobs: int,
+        on_result: Optional[Callable[[CheckResult], None]] = None,
+        match_subclasses: bool = False,
+    ):
+        global _STATE  # pylint: disable=global-statement
+        self.handler_cache = HandlerCache()
+        self.method_cache = MethodCache()
+        self.results: List[CheckResult] = []
+        self.durations: Dict[str, float] = {}
+        index = ContractIndex(contracts)
+
+        _STATE = (contracts, sources, cache, match_subclasses)
+        try:
+            with multiprocessing.get_context("fork").Pool(jobs) as pool:
+                chunks = _chunks(len(sources), jobs)
+                outputs = pool.imap(_check_chunk, chunks)
+                for (start, _), output in zip(chunks, outputs):
+                    reports, hits, misses, method_hits, method_misses, durations = output
+                    self.handler_cache.hits += hits
+                    self.handler_cache.misses += misses
+                    self.method_cache.hits += method_hits
+                    self.method_cache.misses += method_misses
+                    self.durations.update(durations)
+                    for position, module_reports in enumerate(reports, start):
+                        result = load_reports(module_reports, sources[position], cache, index)
+                        if result is None:  # pragma: no cover, check in this process instead
+                            checker = ContractChecker(
+                                contracts,
+                                [sources[position]],
+                                cache,
+                                sources[:position],
+                                match_subclasses=match_subclasses,
+                            )
+                            result = checker.results[0]
+                        self.results.append(result)
+                        if on_result:
+                            on_result(result)
+        finally:
+            _STATE = None
@@ -0,0 +1,63 @@
+"""Measure wall time, CPU time and peak memory of the phases of a run."""
+
+import cProfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import sys
+import time
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, e.g. Windows
+    resource = None  # type: ignore
+
+
+def _peak_memory() -> Optional[int]:
+    # peak resident set size of this process in KiB
+    if resource is None:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+@dataclass(frozen=True)
+class Phase:
+    """Resources used by a phase of a run."""
+
+    name: str
+    wall_time: float  #: seconds
+    cpu_time: float  #: seconds, of this process only (not of worker processes)
+    peak_memory: Optional[int]  #: peak memory of this process so far in KiB, None if unknown
+
+
+@dataclass
+class Profile:
+    """Phases of a run and the time spent checking each module."""
+
+    phases: List[Phase] = field(default_factory=list)
+    modules: Dict[str, float] = field(default_factory=dict)  #: module -> seconds
+
+    @contextmanager
+    def phase(self, name: str, stats_file: Optional[str] = None) -> Iterator[None]:
+        """Measure the enclosed code as phase ``name``. If ``stats_file`` is given, the code is run
+        with cProfile and the stats are dumped to that file (see ``pstats``).
+        """
+        profiler = cProfile.Profile() if stats_file else None
+        wall_time, cpu_time = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(stats_file)
+            self.phases.append(
+                Phase(
+                    name,
+                    time.perf_counter() - wall_time,
+                    time.process_time() - cpu_time,
+                    _peak_memory(),
+                )
+            )
@@ -0,0 +1,63 @@
+"""Compact check results holding only strings and numbers instead of mypy nodes."""
+
+from typing import NamedTuple, Tuple
+
+from plshandle._visitors.contract_checker import CheckResult
+
+
+class ExceptionRecord(NamedTuple):
+    """Same as ``ExceptionResult``, but the exception is referred to by its fullname."""
+
+    exception: str
+    is_propagated: bool
+    is_handled: bool
+    level: int
+
+
+class ReportRecord(NamedTuple):
+    """Same as ``ContractReport``, but the nodes are referred to by their fullnames."""
+
+    function: str  #: function that created the contract
+    exceptions: Tuple[str, ...]  #: exception types required to be handled by the contract
+    contract_module: str  #: module defining the contract
+    contract_path: str
+    scope: str  #: function, class or module calling the function
+    line: int
+    column: int
+    results: Tuple[ExceptionRecord, ...]
+    inferred: bool = False  #: whether the contract was inferred instead of defined
+
+
+class ModuleRecord(NamedTuple):
+    """Same as ``CheckResult``, but without references to the mypy build."""
+
+    module: str
+    path: str
+    reports: Tuple[ReportRecord, ...]
+
+
+def to_record(result: CheckResult) -> ModuleRecord:
+    """Convert the check result of a module to a record."""
+    return ModuleRecord(
+        result.source.module,
+        result.source.path,
+        tuple(
+            ReportRecord(
+                report.contract.function.fullname,
+                tuple(type_.fullname for type_ in report.contract.exception_types),
+                report.contract.source.module,
+                report.contract.source.path,
+                report.scope.fullname,
+                report.context.line,
+                report.context.column,
+                tuple(
+                    ExceptionRecord(
+                        res.exception.fullname, res.is_propagated, res.is_handled, res.level
+                    )
+                    for res in report.results
+                ),
+                report.contract.inferred,
+            )
+            for report in result.reports
+        ),
+    )
@@ -0,0 +1,148 @@
+"""Persist contract check results next to mypy's cache."""
+
+from typing import Dict, List, Optional
+
+from mypy.modulefinder import BuildSource
+from mypy.nodes import ClassDef, Context, Decorator, FuncDef, MypyFile, TypeInfo
+from mypy.traverser import TraverserVisitor
+
+from plshandle._cache import MypyCache
+from plshandle._contract_index import ContractIndex
+from plshandle._contract_store import JsonStore, lookup_node
+from plshandle._visitors.contract_checker import CheckResult, ContractReport, ExceptionResult
+
+
+class _DefinitionFinder(TraverserVisitor):
+    # find a function or class definition by its name and line, used for nested definitions which
+    # cannot be looked up since mypy does not qualify their names
+    def __init__(self, tree: MypyFile, name: str, line: int):
+        super().__init__()
+        self.name = name
+        self.line = line
+        self.found = None
+        tree.accept(self)
+
+    def visit_func_def(self, o: FuncDef):
+        if o.name == self.name and o.line == self.line:
+            self.found = o
+        super().visit_func_def(o)
+
+    def visit_class_def(self, o: ClassDef):
+        if o.name == self.name and o.line == self.line:
+            self.found = o
+        super().visit_class_def(o)
+
+
+def _lookup_scope(scope: dict, source: BuildSource, cache: MypyCache):
+    # the scope is the module, a function or a class definition (see ScopeTracker)
+    if scope["name"] == source.module:
+        return cache.build.files[source.module]
+    node = lookup_node(scope["name"], cache)
+    if isinstance(node, Decorator):
+        node = node.func
+    if isinstance(node, TypeInfo):
+        node = node.defn
+    if isinstance(node, (FuncDef, ClassDef)):
+        return node
+    return _DefinitionFinder(cache.build.files[source.module], scope["name"], scope["line"]).found
+
+
+def _find_contract(report: dict, index: ContractIndex):
+    for contract in index.get(report["function"]):
+        if [type_.fullname for type_ in contract.exception_types] == report["exceptions"]:
+            return contract
+    return None  # pragma: no cover, contract changed
+
+
+def _load_report(report: dict, source: BuildSource, cache: MypyCache, index: ContractIndex):
+    contract = _find_contract(report, index)
+    scope = _lookup_scope(report["scope"], source, cache)
+    exceptions = [lookup_node(result[0], cache) for result in report["results"]]
+    if not contract or not scope or not all(isinstance(e, TypeInfo) for e in exceptions):
+        return None
+
+    context = Context(report["line"], report["column"])
+    context.end_line = report["end_line"]
+    return ContractReport(
+        contract,
+        context,
+        scope,
+        [
+            ExceptionResult(exception, *result[1:])
+            for exception, result in zip(exceptions, report["results"])
+        ],
+    )
+
+
+def dump_reports(result: CheckResult) -> List[dict]:
+    """Convert the reports of a check result to builtin types, referring to nodes by name."""
+    return [
+        {
+            "function": report.contract.function.fullname,
+            "exceptions": [type_.fullname for type_ in report.contract.exception_types],
+            "scope": {"name": report.scope.fullname, "line": report.scope.line},
+            "line": report.context.line,
+            "column": report.context.column,
+            "end_line": report.context.end_line,
+            "results": [
+                [res.exception.fullname, res.is_propagated, res.is_handled, res.level]
+                for res in report.results
+            ],
+        }
+        for report in result.reports
+    ]
+
+
+def load_reports(
+    reports: List[dict], source: BuildSource, cache: MypyCache, index: ContractIndex
+) -> Optional[CheckResult]:
+    """Inverse of ``dump_reports()``, looks up all nodes in the given build. Returns ``None`` if
+    not all contracts, scopes and exception types could be found.
+    """
+    loaded = [_load_report(report, source, cache, index) for report in reports]
+    if not all(loaded):
+        return None  # pragma: no cover, e.g. nested functions are not fully qualified
+    return CheckResult(source, loaded)
+
+
+class ResultStore(JsonStore):
+    """Store the check results per module on disk. An entry is only reused if the module itself
+    did not change and it was checked with the same ``settings`` (e.g. ``match_subclasses``), it is
+    up to the caller to decide whether changes to other modules affect it.
+    """
+
+    filename = "results.json"
+
+    def __init__(self, path: Optional[str]):
+        super().__init__(path)
+        self.settings: Dict[str, bool] = {}  #: settings the stored results depend on
+
+    def load(
+        self, source: BuildSource, cache: MypyCache, index: ContractIndex
+    ) -> Optional[CheckResult]:
+        """Load the check result of the given module. Returns ``None`` if the module changed or if
+        not all contracts, scopes and exception types could be found in the current build.
+        """
+        entry = self._get(source, cache)
+        if entry is None:
+            return None
+        if entry.get("settings", {}) != self.settings:
+            self.misses += 1
+            return None
+
+        result = load_reports(entry["reports"], source, cache, index)
+        if result is None:
+            self.misses += 1  # pragma: no cover
+            return None  # pragma: no cover
+
+        self.hits += 1
+        return result
+
+    def store(self, result: CheckResult, cache: MypyCache):
+        """Remember the check result of a module."""
+        self._set(
+            result.source,
+            cache,
+            reports=dump_reports(result),
+            settings=self.settings,
+        )
@@ -0,0 +1,208 @@
+"""Check contracts repeatedly while keeping the mypy build, contracts and results in memory."""
+
+from contextlib import contextmanager
+import os
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from mypy.modulefinder import BuildSource
+from mypy.options import Options
+
+from plshandle._cache import MypyCache
+from plshandle._changed_modules import affected_modules, dependent_modules
+from plshandle._cli import CLIResult, _collect_modules_and_package_roots, _make_cache, _settings
+from plshandle._cli_utils.config import Config
+from plshandle._contract_store import ContractStore
+from plshandle._gather_modules import DirectoryCache
+from plshandle._inference import ContractInference
+from plshandle._profile import Profile
+from plshandle._visitors.contract_checker import CheckResult, ContractChecker
+from plshandle._visitors.contract_collector import Contract, ContractCollector
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def _restored_sys_path() -> Iterator[None]:
+    # gathering modules and the mypy build need the package roots on sys.path, but the session
+    # must not leave them there
+    saved = list(sys.path)
+    try:
+        yield
+    finally:
+        sys.path[:] = saved
+
+
+class _PreviousContracts(ContractStore):
+    # in-memory store of the contracts collected during the last check, reused for all modules
+    # not affected by changes
+    def __init__(self, contracts: Dict[str, List[Contract]], affected: Set[str]):
+        super().__init__(None)
+        self._contracts = contracts
+        self._affected = affected
+
+    def load(self, source, cache):
+        if source.module in self._affected or source.module not in self._contracts:
+            return None
+        self.hits += 1
+        return [(c.function, c.exception_types) for c in self._contracts[source.module]]
+
+    def store(self, source, cache, contracts):
+        pass
+
+
+class Session:
+    """Mypy build, contracts and check results of the last check. Subsequent checks only update
+    the build for files whose modification time or size changed (or that were passed to
+    ``update()``), and only collect and check the modules affected by them. ``mypy_options``
+    creates the options of a new build, which is needed whenever modules are added or removed.
+    ``sys.path`` is the same after each call as before.
+    """
+
+    def __init__(self, mypy_options: Callable[[], Options] = Options):
+        self._mypy_options = mypy_options
+        self._directories = DirectoryCache()  # listings of the directories of the last check
+        self._key: Optional[tuple] = None
+        self._cache: Optional[MypyCache] = None
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._contracts: Dict[str, List[Contract]] = {}
+        self._results: Dict[str, CheckResult] = {}
+        self._affected: Set[str] = set()  # updated, but not checked yet
+        self._settings: Dict[str, bool] = {}  # of the last check
+        self._inference: Optional[ContractInference] = None  # call graph of the last check
+
+    def _refresh(self, modules: Sequence[BuildSource], package_roots: List[str]) -> Set[str]:
+        # update the build, returns the modules that need to be collected and checked again
+        key = (tuple((source.module, source.path) for source in modules), tuple(package_roots))
+        if key != self._key:
+            # modules were added or removed, start from scratch
+            self._cache = _make_cache(modules, package_roots, self._mypy_options(), True)
+            self._contracts.clear()
+            self._results.clear()
+            self._inference = None
+            self._key = key
+            self._stamps = {source.path: _stamp(source.path) for source in modules}
+            self._affected = set()
+            return {source.module for source in modules}
+
+        changed = [
+            source for source in modules if _stamp(source.path) != self._stamps[source.path]
+        ]
+        affected = self._update(changed) | self._affected
+        self._affected = set()
+        return affected
+
+    def _update(self, changed: Sequence[BuildSource]) -> Set[str]:
+        if not changed:
+            return set()
+        self._cache.update(changed)
+        self._stamps.update((source.path, _stamp(source.path)) for source in changed)
+        return affected_modules([source.path for source in changed], self._cache.build.graph)
+
+    def update(self, paths: Iterable[str]) -> Set[str]:
+        """Update the build for the given changed files right away, e.g. when an editor saves
+        them, even if their modification time and size did not change. Files of modules not
+        checked by the last check are ignored. Returns the modules to be checked again.
+        """
+        if self._key is None:
+            return set()
+        paths = {os.path.normcase(os.path.realpath(path)) for path in paths}
+        changed = [
+            BuildSource(path, module, None)
+            for module, path in self._key[0]
+            if os.path.normcase(os.path.realpath(path)) in paths
+        ]
+        affected = self._update(changed)
+        self._affected |= affected
+        return affected
+
+    def check(
+        self,
+        modules: Iterable[str] = (),
+        packages: Iterable[str] = (),
+        directories: Iterable[str] = (),
+    ) -> CLIResult:
+        """Same as ``plshandle.cli(["-m", module, "-p", package, "-d", directory, ...])``, but
+        reuses everything not affected by changes since the last check.
+        """
+        return self.check_config(
+            Config(directory=list(directories), package=list(packages), module=list(modules))
+        )
+
+    def check_config(self, config: Config) -> CLIResult:
+        """Check the modules, packages and directories of ``config``, see ``check()``."""
+        profile = Profile()
+        skipped: Dict[str, int] = {}
+        with _restored_sys_path():
+            with profile.phase("gather modules"):
+                modules, package_roots = _collect_modules_and_package_roots(
+                    config, self._directories, skipped
+                )
+            if not modules:  # pragma: no cover
+                return CLIResult(config, modules, [], [])
+
+            with profile.phase("mypy update"):
+                affected = self._refresh(modules, package_roots)
+        store = _PreviousContracts(self._contracts, affected)
+        with profile.phase("collect contracts"):
+            contracts = ContractCollector(modules, self._cache, store).contracts
+        self._contracts = {source.module: [] for source in modules}
+        for contract in contracts:
+            self._contracts.setdefault(contract.source.module, []).append(contract)
+        if not contracts:  # pragma: no cover
+            self._results.clear()
+            return CLIResult(config, modules, contracts, [])
+
+        if _settings(config) != self._settings:
+            self._results.clear()  # the results depend on them, check everything again
+            self._inference = None
+            self._settings = _settings(config)
+
+        relevant = dependent_modules(
+            {contract.source.module for contract in contracts}, self._cache.build.graph
+        )
+        if config.infer:
+            # only the call graph of affected modules changed since the last inference, if any
+            inferred_before = self._inference is not None
+            if self._inference is None:
+                self._inference = ContractInference(config.match_subclasses)
+            with profile.phase("infer contracts"):
+                inferred = self._inference.infer(
+                    contracts,
+                    [source for source in modules if source.module in relevant],
+                    self._cache,
+                    affected if inferred_before else None,
+                )
+            contracts = [*contracts, *inferred]
+        to_check = []
+        for source in modules:
+            if source.module not in relevant:
+                self._results[source.module] = CheckResult(source, [])
+            elif source.module in affected or source.module not in self._results:
+                to_check.append(source)
+        with profile.phase("check contracts", config.profile_stats):
+            checker = ContractChecker(
+                contracts, to_check, self._cache, match_subclasses=config.match_subclasses
+            )
+        profile.modules.update(checker.durations)
+        self._results.update((result.source.module, result) for result in checker.results)
+
+        statistics = {
+            **skipped,
+            "reused contracts": store.hits,
+            "skipped modules": sum(source.module not in relevant for source in modules),
+            "checked modules": len(checker.results),
+            "handler cache hits": checker.handler_cache.hits,
+            "handler cache misses": checker.handler_cache.misses,
+            "method cache hits": checker.method_cache.hits,
+            "method cache misses": checker.method_cache.misses,
+        }
+        if config.infer:
+            statistics["inferred contracts"] = len(inferred)
+            statistics["recomputed call graph components"] = self._inference.recomputed
+            statistics["reused call graph components"] = self._inference.reused
+        results = [self._results[source.module] for source in modules]
+        return CLIResult(config, modules, contracts, results, statistics, profile)
@@ -0,0 +1,33 @@
+"""Split the modules to check into deterministic shards of about the same size."""
+
+import heapq
+import os
+from typing import List, Sequence, Tuple
+
+from mypy.modulefinder import BuildSource
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse ``I/N`` into ``(I, N)``. Raises ``ValueError`` unless ``1 <= I <= N``."""
+    index, _, count = value.partition("/")
+    shard = int(index), int(count)
+    if not 1 <= shard[0] <= shard[1]:
+        raise ValueError("expected I/N with 1 <= I <= N, got '{}'".format(value))
+    return shard
+
+
+def shard_modules(modules: Sequence[BuildSource], index: int, count: int) -> List[BuildSource]:
+    """Select the modules of shard ``index`` (1-based) of ``count``, keeping their order. Modules
+    are assigned to shards by file size, largest first, each to the smallest shard so far. The
+    assignment only depends on the modules and their files, not on their order, so every node
+    computes the same shards.
+    """
+    sizes = {source.module: os.path.getsize(source.path) for source in modules}
+    shards = [(0, shard) for shard in range(1, count + 1)]  # (total size, shard)
+    assigned = set()
+    for module in sorted(sizes, key=lambda module: (-sizes[module], module)):
+        total, shard = heapq.heappop(shards)
+        if shard == index:
+            assigned.add(module)
+        heapq.heappush(shards, (total + sizes[module], shard))
+    return [source for source in modules if source.module in assigned]
@@ -0,0 +1,3 @@
+"""Version of plshandle."""
+
+__version__ = "0.2"
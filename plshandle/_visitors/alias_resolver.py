@@ -1,26 +1,79 @@
 """Resolve aliases while keeping the scope in mind."""
 
-from functools import reduce
 from typing import List, Dict
 
-from mypy.nodes import NameExpr, FuncDef, AssignmentStmt, SymbolNode, RefExpr
+from mypy.nodes import NameExpr, FuncDef, AssignmentStmt, MypyFile, SymbolNode, RefExpr
 from mypy.traverser import TraverserVisitor
 
 from mypy_extensions import mypyc_attr
 
 
+class AliasTable:
+    """Scoped alias table. Each symbol has its own stack of targets, one entry per scope that
+    assigned it, so the innermost assignment shadows the outer ones. Resolved aliases are memoized
+    until the table changes.
+    """
+
+    def __init__(self):
+        self._targets: Dict[SymbolNode, List[SymbolNode]] = {}
+        self._scopes: List[Dict[SymbolNode, None]] = [{}]  # symbols assigned in each scope
+        self._resolved: Dict[SymbolNode, SymbolNode] = {}
+
+    def push_scope(self):
+        """Enter a new scope."""
+        self._scopes.append({})
+
+    def pop_scope(self):
+        """Leave the current scope, dropping all aliases assigned in it."""
+        symbols = self._scopes.pop()
+        for symbol in symbols:
+            targets = self._targets[symbol]
+            targets.pop()
+            if not targets:
+                del self._targets[symbol]
+        if symbols:
+            self._resolved.clear()
+
+    def assign(self, alias: SymbolNode, target: SymbolNode):
+        """Make ``alias`` refer to ``target`` in the current scope."""
+        if alias in self._scopes[-1]:
+            self._targets[alias][-1] = target  # reassigned within the same scope
+        else:
+            self._scopes[-1][alias] = None
+            self._targets.setdefault(alias, []).append(target)
+        self._resolved.clear()
+
+    def resolve(self, alias: SymbolNode) -> SymbolNode:
+        """Follow the chain of aliases. Stops at the first symbol seen twice if they are cyclic."""
+        try:
+            return self._resolved[alias]
+        except KeyError:
+            pass
+
+        seen = {alias}
+        resolved = alias
+        while resolved in self._targets:
+            resolved = self._targets[resolved][-1]
+            if resolved in seen:
+                break
+            seen.add(resolved)
+
+        self._resolved[alias] = resolved
+        return resolved
+
+
 @mypyc_attr(allow_interpreted_subclasses=True)
 class AliasResolver(TraverserVisitor):
     """Resolve aliases while keeping the scope in mind."""
 
     def __init__(self):
         super().__init__()
-        self.alias_scopes: List[Dict[SymbolNode, SymbolNode]] = [{}]
+        self.aliases = AliasTable()
 
     def visit_func_def(self, o: FuncDef):
-        self.alias_scopes.append({})
+        self.aliases.push_scope()
         super().visit_func_def(o)
-        self.alias_scopes.pop()
+        self.aliases.pop_scope()
 
     def visit_assignment_stmt(self, o: AssignmentStmt):
         super().visit_assignment_stmt(o)
@@ -32,11 +85,16 @@ class AliasResolver(TraverserVisitor):
             and isinstance(o.rvalue, RefExpr)
             and o.rvalue.node is not None
         ):
-            self.alias_scopes[-1][o.lvalues[0].node] = o.rvalue.node
+            self.aliases.assign(o.lvalues[0].node, o.rvalue.node)
+
+    def register_aliases(self, tree: MypyFile):
+        """Register the module level aliases of a module without traversing it. Modules traversed
+        later on might refer to them.
+        """
+        for stmt in tree.defs:
+            if isinstance(stmt, AssignmentStmt):
+                self.visit_assignment_stmt(stmt)
 
     def resolve_alias(self, alias: SymbolNode):
         """Resolve the given node alias or returns itself if no alias."""
-        all_aliases = reduce(lambda x, y: {**x, **y}, self.alias_scopes)
-        while alias in all_aliases:
-            alias = all_aliases[alias]
-        return alias
+        return self.aliases.resolve(alias)
@@ -0,0 +1,99 @@
+"""Record which functions each function calls."""
+
+from typing import Container, Dict, FrozenSet, Iterable, Set
+
+from mypy.modulefinder import BuildSource
+from mypy.nodes import CallExpr, FuncDef, Statement, TryStmt, TypeInfo
+
+from mypy_extensions import mypyc_attr
+
+from plshandle._cache import MypyCache
+from plshandle._visitors.alias_resolver import AliasResolver
+from plshandle._visitors.scope_tracker import ScopeFrame, ScopeTracker
+from plshandle._ast_utils.resolve_called_functions import MethodCache, resolve_called_functions
+from plshandle._ast_utils.resolve_exception_types import ExceptionIndex
+from plshandle._ast_utils.resolve_handled_types import resolve_handled_types
+
+
+#: functions called by a function, grouped by the exception types handled around the calls
+#: within the calling function
+Calls = Dict[FrozenSet[TypeInfo], Set[FuncDef]]
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class CallGraphBuilder(ScopeTracker, AliasResolver):
+    """Record the functions called by each function defined in ``sources``, together with the
+    exception types handled by try statements enclosing the calls within the calling function.
+    Calls on module or class level are not recorded. Only the module level aliases of the modules
+    in ``skipped`` are registered, they are not traversed.
+    """
+
+    def __init__(
+        self, sources: Iterable[BuildSource], cache: MypyCache, skipped: Container[str] = ()
+    ):
+        super().__init__()
+        self.cache = cache
+        self.exception_index = ExceptionIndex()
+        self.method_cache = MethodCache()
+        #: calls of each function per module, in the order the functions are defined
+        self.calls: Dict[str, Dict[FuncDef, Calls]] = {}
+        self._depths: Dict[FuncDef, int] = {}
+        self._handled: Dict[ScopeFrame, FrozenSet[TypeInfo]] = {}
+        self._try_types: Dict[Statement, FrozenSet[TypeInfo]] = {}
+
+        for source in sources:
+            tree = cache.build.files[source.module]
+            if source.module in skipped:
+                self.register_aliases(tree)
+                continue
+            self.module = source.module
+            self._calls = self.calls[source.module] = {}
+            self.visit_mypy_file(tree)
+            # frames and statements are unique per module
+            self._depths.clear()
+            self._handled.clear()
+            self._try_types.clear()
+
+    def visit_func_def(self, o: FuncDef):
+        self._calls[o] = {}
+        self._depths[o] = self.frame.depth + 1 if self.frame else 1
+        super().visit_func_def(o)
+
+    def visit_call_expr(self, o: CallExpr):
+        super().visit_call_expr(o)
+        frame = self.frame
+        if frame is None or not isinstance(frame.node, FuncDef):
+            return
+        functions = set(
+            resolve_called_functions(o, self, self.cache.build.types, self.method_cache)
+        )
+        if functions:
+            calls = self._calls[frame.node]  # type: ignore
+            calls.setdefault(self._handled_within(frame), set()).update(functions)
+
+    def _resolve_types(self, stmt: Statement):
+        if not isinstance(stmt, TryStmt):
+            return None  # decorators of enclosing functions are outside of the calling function
+        try:
+            types = self._try_types[stmt]
+        except KeyError:
+            types = self._try_types[stmt] = frozenset(
+                resolve_handled_types(
+                    stmt, self.cache.build.types, self.module, self.exception_index
+                )
+            )
+        return False, types
+
+    def _handled_within(self, frame: ScopeFrame) -> FrozenSet[TypeInfo]:
+        # the types handled by try statements between the innermost function and the call
+        try:
+            return self._handled[frame]
+        except KeyError:
+            pass
+        depth = self._depths[frame.node]  # type: ignore
+        handled = self._handled[frame] = frozenset(
+            type_
+            for type_, (handler_depth, _) in frame.exceptions(self._resolve_types).items()
+            if handler_depth > depth
+        )
+        return handled
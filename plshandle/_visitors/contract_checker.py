@@ -1,19 +1,31 @@
 """Check whether all contracts are fulfilled in all modules."""
 
 from dataclasses import dataclass
-from typing import Sequence, List
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Sequence, List, Tuple
 
 from mypy.modulefinder import BuildSource
-from mypy.nodes import Context, FuncDef, TryStmt, Decorator, CallExpr, SymbolNode, TypeInfo
+from mypy.nodes import (
+    Context,
+    FuncDef,
+    TryStmt,
+    Decorator,
+    CallExpr,
+    Statement,
+    SymbolNode,
+    TypeInfo,
+)
 
 from mypy_extensions import mypyc_attr
 
 from plshandle._cache import MypyCache
+from plshandle._contract_index import ContractIndex
 from plshandle._visitors.contract_collector import Contract
 from plshandle._visitors.alias_resolver import AliasResolver
 from plshandle._visitors.scope_tracker import ScopeTracker
-from plshandle._ast_utils.resolve_called_functions import resolve_called_functions
+from plshandle._ast_utils.resolve_called_functions import MethodCache, resolve_called_functions
 from plshandle._ast_utils.resolve_contract import resolve_contract
+from plshandle._ast_utils.resolve_exception_types import ExceptionIndex
 from plshandle._ast_utils.resolve_handled_types import resolve_handled_types
 
 
@@ -60,6 +72,33 @@ class CheckResult:
     reports: Sequence[ContractReport]
 
 
+class HandlerCache:
+    """Memoize the exception types handled by a try statement or propagated by a decorator, so
+    they are resolved once per statement instead of once per enclosed call and exception.
+    """
+
+    def __init__(self):
+        self._types: Dict[Statement, FrozenSet[TypeInfo]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, stmt: Statement, resolve: Callable[[], Iterable[TypeInfo]]
+    ) -> FrozenSet[TypeInfo]:
+        """Get the types of ``stmt``, calling ``resolve`` if not cached yet."""
+        try:
+            types = self._types[stmt]
+            self.hits += 1
+        except KeyError:
+            types = self._types[stmt] = frozenset(resolve())
+            self.misses += 1
+        return types
+
+    def clear(self):
+        """Drop all cached types, but keep the statistics."""
+        self._types.clear()
+
+
 @dataclass(init=False)
 class _CheckerState:
     # ugly per-source state
@@ -75,59 +114,115 @@ class _CheckerState:
 
 @mypyc_attr(allow_interpreted_subclasses=True)
 class ContractChecker(ScopeTracker, AliasResolver):
-    """Check whether all contracts are fulfilled in all modules."""
-
-    def __init__(
-        self, contracts: Sequence[Contract], sources: Sequence[BuildSource], cache: MypyCache
+    """Check whether all contracts are fulfilled in all modules. The module level aliases of the
+    optional ``preceding`` modules are registered as if they were checked before ``sources``. The
+    result of each module is passed to the optional ``on_result`` as soon as it is checked. With
+    ``release``, the AST of each module is released once it is checked, see ``MypyCache.release()``.
+    With ``match_subclasses``, handling or propagating a base class of an exception (e.g.
+    ``LookupError`` for ``KeyError``) fulfills the contract as well. Functions with an inferred
+    contract propagate its exception types like a decorator would.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        contracts: Sequence[Contract],
+        sources: Sequence[BuildSource],
+        cache: MypyCache,
+        preceding: Sequence[BuildSource] = (),
+        on_result: Optional[Callable[[CheckResult], None]] = None,
+        release: bool = False,
+        match_subclasses: bool = False,
     ):
         super().__init__()
         self.contracts = contracts
+        self.index = ContractIndex(contracts)
+        self.inferred = {
+            contract.function: frozenset(contract.exception_types)
+            for contract in contracts
+            if contract.inferred
+        }
         self.cache = cache
+        self.match_subclasses = match_subclasses
+        self.exception_index = ExceptionIndex()
+        self.handler_cache = HandlerCache()
+        self.method_cache = MethodCache()
         self.results: List[CheckResult] = []
+        self.durations: Dict[str, float] = {}  #: seconds spent checking each module
+
+        for source in preceding:
+            self.register_aliases(cache.build.files[source.module])
 
         # traverse all nodes and populate self.results
         for source in sources:
+            start = time.perf_counter()
+            self.handler_cache.clear()  # statements are unique per module
             self.current_state = _CheckerState(source, cache)
             self.visit_mypy_file(self.current_state.root)
             self.results.append(CheckResult(source, self.current_state.reports))
+            self.durations[source.module] = time.perf_counter() - start
+            if on_result:
+                on_result(self.results[-1])
+            if release:
+                cache.release(source.module)
 
     def visit_call_expr(self, o: CallExpr):
         super().visit_call_expr(o)
 
-        functions = tuple(resolve_called_functions(o, self, self.cache.build.types))
-        self.current_state.reports.extend(self._get_reports(o, functions))
-
-    def _is_propagated(self, decorator: Decorator, exception: TypeInfo):
-        return any(
-            type_ == exception
-            for type_ in resolve_contract(
-                decorator, self, self.cache.build.types, self.current_state.module
-            )
+        functions = resolve_called_functions(o, self, self.cache.build.types, self.method_cache)
+        self._check_call(o, functions)
+
+    def _check_call(self, context: Context, functions: Iterable[FuncDef]):
+        self.current_state.reports.extend(self._get_reports(context, functions))
+
+    def _propagated_types(self, decorator: Decorator):
+        return self.handler_cache.get(
+            decorator,
+            lambda: resolve_contract(
+                decorator,
+                self,
+                self.cache.build.types,
+                self.current_state.module,
+                self.exception_index,
+            ),
         )
 
-    def _is_handled(self, try_: TryStmt, exception: TypeInfo):
-        return any(
-            type_ == exception
-            for type_ in resolve_handled_types(
-                try_, self.cache.build.types, self.current_state.module
-            )
+    def _handled_types(self, try_: TryStmt):
+        return self.handler_cache.get(
+            try_,
+            lambda: resolve_handled_types(
+                try_, self.cache.build.types, self.current_state.module, self.exception_index
+            ),
         )
 
+    def _resolve_types(self, stmt: Statement) -> Optional[Tuple[bool, FrozenSet[TypeInfo]]]:
+        if isinstance(stmt, TryStmt):
+            return False, self._handled_types(stmt)
+        if isinstance(stmt, Decorator):
+            return True, self._propagated_types(stmt)
+        if isinstance(stmt, FuncDef) and stmt in self.inferred:
+            return True, self.inferred[stmt]
+        return None
+
     def _check_exception(self, exception: TypeInfo):
-        for stmt, level in self.traverse_scope():
-            if isinstance(stmt, TryStmt) and self._is_handled(stmt, exception):
-                return ExceptionResult(exception, False, True, level)
-            if isinstance(stmt, Decorator) and self._is_propagated(stmt, exception):
-                return ExceptionResult(exception, True, False, 0)
-
-        return ExceptionResult(exception, False, False, 0)
-
-    def _get_reports(self, context: Context, functions: Sequence[FuncDef]):
-        for contract in self.contracts:
-            if contract.function in functions:
-                yield ContractReport(
-                    contract,
-                    context,
-                    self.determine_current_node(self.current_state.root),
-                    [self._check_exception(e) for e in contract.exception_types],
-                )
+        # the innermost statement handling or propagating the exception (or one of its base
+        # classes with match_subclasses), looked up in the cumulative map of the current scope
+        exceptions = self.frame.exceptions(self._resolve_types) if self.frame else {}
+        candidates = exception.mro if self.match_subclasses else (exception,)
+        nearest = max(
+            (exceptions[type_] for type_ in candidates if type_ in exceptions), default=None
+        )
+        if nearest is None:
+            return ExceptionResult(exception, False, False, 0)
+        depth, propagated = nearest
+        if propagated:
+            return ExceptionResult(exception, True, False, 0)
+        return ExceptionResult(exception, False, True, self.frame.depth - depth + 1)  # type: ignore
+
+    def _get_reports(self, context: Context, functions: Iterable[FuncDef]):
+        for contract in self.index.lookup(functions):
+            yield ContractReport(
+                contract,
+                context,
+                self.determine_current_node(self.current_state.root),
+                [self._check_exception(e) for e in contract.exception_types],
+            )
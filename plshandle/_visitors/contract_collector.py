@@ -1,7 +1,7 @@
 """Collect contracts defined in modules."""
 
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
 from mypy.modulefinder import BuildSource
 from mypy.nodes import FuncDef, Decorator, TypeInfo
@@ -9,42 +9,72 @@ from mypy.nodes import FuncDef, Decorator, TypeInfo
 from mypy_extensions import mypyc_attr
 
 from plshandle._cache import MypyCache
+from plshandle._contract_store import ContractStore
 from plshandle._visitors.alias_resolver import AliasResolver
 from plshandle._ast_utils.resolve_contract import resolve_contract
+from plshandle._ast_utils.resolve_exception_types import ExceptionIndex
 
 
 @dataclass(frozen=True, repr=False)
 class Contract:
-    """Contract created by ``function``, requires handling ``exception_types``."""
+    """Contract created by ``function``, requires handling ``exception_types``. An ``inferred``
+    contract is not defined by a decorator, but the function lets the exceptions of contracts it
+    calls escape (see ``--infer``).
+    """
 
     source: BuildSource
     function: FuncDef
     exception_types: Iterable[TypeInfo]
+    inferred: bool = False
 
     def __repr__(self):
-        return "_Contract(source={}, function={}, exception_types={})".format(
+        return "_Contract(source={}, function={}, exception_types={}{})".format(
             self.source,
             self.function.fullname,
             "[{}]".format(", ".join([t.fullname for t in self.exception_types])),
+            ", inferred=True" if self.inferred else "",
         )
 
 
 @mypyc_attr(allow_interpreted_subclasses=True)
 class ContractCollector(AliasResolver):
-    """Collect contracts defined in the given sources."""
+    """Collect contracts defined in the given sources. Modules whose contracts are found in the
+    optional ``store`` are not traversed.
+    """
 
-    def __init__(self, sources: Iterable[BuildSource], cache: MypyCache):
+    def __init__(
+        self,
+        sources: Iterable[BuildSource],
+        cache: MypyCache,
+        store: Optional[ContractStore] = None,
+    ):
         super().__init__()
         self.types = cache.build.types
+        self.store = store or ContractStore(None)
+        self.exception_index = ExceptionIndex()
         self.contracts: List[Contract] = []
 
         # traverse all nodes and populate self.contracts
         for source in sources:
             self.source = source
-            self.visit_mypy_file(cache.build.files[source.module])
+            tree = cache.build.files[source.module]
+            stored = self.store.load(source, cache)
+            if stored is None:
+                first = len(self.contracts)
+                self.visit_mypy_file(tree)
+                self.store.store(
+                    source,
+                    cache,
+                    [(c.function, c.exception_types) for c in self.contracts[first:]],
+                )
+            else:
+                self.contracts.extend(Contract(source, *contract) for contract in stored)
+                self.register_aliases(tree)
 
     def visit_decorator(self, o: Decorator):
         super().visit_decorator(o)
-        types = tuple(resolve_contract(o, self, self.types, self.source.module))
+        types = tuple(
+            resolve_contract(o, self, self.types, self.source.module, self.exception_index)
+        )
         if types:
             self.contracts.append(Contract(self.source, o.func, types))
@@ -0,0 +1,115 @@
+"""Collect and check contracts in a single traversal of each module."""
+
+from dataclasses import dataclass
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mypy.modulefinder import BuildSource
+from mypy.nodes import Context, Decorator, FuncDef
+
+from mypy_extensions import mypyc_attr
+
+from plshandle._cache import MypyCache
+from plshandle._contract_index import ContractIndex
+from plshandle._contract_store import ContractStore
+from plshandle._visitors.contract_checker import CheckResult, ContractChecker, _CheckerState
+from plshandle._visitors.contract_collector import Contract
+from plshandle._visitors.scope_tracker import ScopeFrame
+from plshandle._ast_utils.resolve_contract import resolve_contract
+
+
+@dataclass(frozen=True)
+class _CallSite:
+    # call expression that may call a contract function, with the scope it was found in
+    context: Context
+    frame: Optional[ScopeFrame]
+    functions: Tuple[FuncDef, ...]
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class ContractEngine(ContractChecker):
+    """Same as ``ContractCollector`` followed by ``ContractChecker``, but traverses each module
+    only once. Calls of decorated functions (the only ones that can define a contract) are recorded
+    with their scope and checked once the contracts of all modules are known. Contracts found in the
+    optional ``store`` are not resolved again. Only the calls of the ``checked`` modules (default:
+    all) are recorded, modules which are neither checked nor have stored contracts are not
+    traversed at all. ``on_result``, ``release`` and ``match_subclasses`` are the same as for
+    ``ContractChecker``, the results are in the order of ``checked``.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        sources: Sequence[BuildSource],
+        cache: MypyCache,
+        store: Optional[ContractStore] = None,
+        checked: Optional[Sequence[BuildSource]] = None,
+        on_result: Optional[Callable[[CheckResult], None]] = None,
+        release: bool = False,
+        match_subclasses: bool = False,
+    ):
+        super().__init__((), (), cache, match_subclasses=match_subclasses)
+        self.store = store or ContractStore(None)
+        self.contracts: List[Contract] = []
+        checked = sources if checked is None else checked
+        checked_modules = {source.module for source in checked}
+        call_sites: Dict[str, List[_CallSite]] = {}
+
+        # traverse each module once, collecting contracts and recording call sites
+        for source in sources:
+            start = time.perf_counter()
+            self.current_state = _CheckerState(source, cache)
+            self._source = source
+            self._call_sites: Optional[List[_CallSite]] = None
+            if source.module in checked_modules:
+                self._call_sites = call_sites[source.module] = []
+            stored = self.store.load(source, cache)
+            self._collect = stored is None
+            if stored is not None:
+                self.contracts.extend(Contract(source, *contract) for contract in stored)
+            if self._collect or self._call_sites is not None:
+                first = len(self.contracts)
+                self.visit_mypy_file(self.current_state.root)
+                if self._collect:
+                    self.store.store(
+                        source,
+                        cache,
+                        [(c.function, c.exception_types) for c in self.contracts[first:]],
+                    )
+            else:
+                self.register_aliases(self.current_state.root)
+            self.durations[source.module] = time.perf_counter() - start
+
+        # check the recorded call sites now that all contracts are known
+        self.index = ContractIndex(self.contracts)
+        for source in checked:
+            start = time.perf_counter()
+            self.handler_cache.clear()  # statements are unique per module
+            self.current_state = _CheckerState(source, cache)
+            for site in call_sites[source.module]:
+                self.frame = site.frame
+                self.current_state.reports.extend(self._get_reports(site.context, site.functions))
+            self.frame = None
+            self.results.append(CheckResult(source, self.current_state.reports))
+            self.durations[source.module] += time.perf_counter() - start
+            if on_result:
+                on_result(self.results[-1])
+            if release:
+                cache.release(source.module)
+
+    def visit_decorator(self, o: Decorator):
+        super().visit_decorator(o)
+        if self._collect:
+            types = tuple(
+                resolve_contract(
+                    o, self, self.cache.build.types, self._source.module, self.exception_index
+                )
+            )
+            if types:
+                self.contracts.append(Contract(self._source, o.func, types))
+
+    def _check_call(self, context: Context, functions: Iterable[FuncDef]):
+        if self._call_sites is None:
+            return  # module is not checked, do not even resolve the called functions
+        decorated = tuple(function for function in functions if function.is_decorated)
+        if decorated:
+            self._call_sites.append(_CallSite(context, self.frame, decorated))
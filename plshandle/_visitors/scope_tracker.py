@@ -1,69 +1,115 @@
 """Keep track of the scope so it can be traversed upwards."""
 
-from typing import List, Iterator, Tuple
+from typing import Callable, Dict, FrozenSet, List, Iterator, Optional, Tuple
 
-from mypy.nodes import Statement, FuncDef, ClassDef, SymbolNode
+from mypy.nodes import Statement, FuncDef, ClassDef, SymbolNode, TypeInfo
 from mypy.traverser import TraverserVisitor
 
 from mypy_extensions import mypyc_attr
 
 
+#: exception types handled (``False``) or propagated (``True``) by a statement, if any
+ResolveTypes = Callable[[Statement], Optional[Tuple[bool, FrozenSet[TypeInfo]]]]
+
+
+class ScopeFrame:
+    """Statement on the scope stack. Frames are immutable and link to the enclosing frame, so a
+    frame is a snapshot of the whole scope.
+    """
+
+    __slots__ = ("stmt", "parent", "depth", "node", "_exceptions")
+
+    def __init__(self, stmt: Statement, parent: Optional["ScopeFrame"]):
+        self.stmt = stmt
+        self.parent = parent
+        self.depth: int = parent.depth + 1 if parent else 1  #: 1 = outermost statement
+        #: innermost enclosing function or class definition, if any
+        self.node: Optional[SymbolNode] = (
+            stmt if isinstance(stmt, (FuncDef, ClassDef)) else parent.node if parent else None
+        )
+        self._exceptions: Optional[Dict[TypeInfo, Tuple[int, bool]]] = None
+
+    def exceptions(self, resolve: ResolveTypes) -> Dict[TypeInfo, Tuple[int, bool]]:
+        """Map each exception type handled or propagated by this or an enclosing statement to the
+        depth of the innermost such statement and whether it propagates the exception. Computed
+        once per frame from the map of the enclosing frame, ``resolve`` is only called for
+        statements not resolved yet.
+        """
+        if self._exceptions is None:
+            inherited = self.parent.exceptions(resolve) if self.parent else {}
+            resolved = resolve(self.stmt)
+            if resolved and resolved[1]:
+                propagated, types = resolved
+                self._exceptions = dict(inherited)
+                self._exceptions.update((type_, (self.depth, propagated)) for type_ in types)
+            else:
+                self._exceptions = inherited  # shared, never modified
+        return self._exceptions
+
+
 @mypyc_attr(allow_interpreted_subclasses=True)
 class ScopeTracker(TraverserVisitor):
     """Keep track of the scope so it can be traversed upwards."""
 
     def __init__(self):
         super().__init__()
-        self.scope: List[Statement] = []
+        self.frame: Optional[ScopeFrame] = None  #: innermost statement of the current scope
+
+    @property
+    def scope(self) -> List[Statement]:
+        """Statements of the current scope, outermost first."""
+        return [stmt for stmt, _ in self.traverse_scope()][::-1]
+
+    def _push(self, o: Statement):
+        self.frame = ScopeFrame(o, self.frame)
+
+    def _pop(self):
+        self.frame = self.frame.parent  # type: ignore
 
     def visit_decorator(self, o):
-        self.scope.append(o)
+        self._push(o)
         super().visit_decorator(o)
-        self.scope.pop()
+        self._pop()
 
     def visit_func_def(self, o):
-        self.scope.append(o)
+        self._push(o)
         super().visit_func_def(o)
-        self.scope.pop()
+        self._pop()
 
     def visit_try_stmt(self, o):
-        self.scope.append(o)
+        self._push(o)
         super().visit_try_stmt(o)
-        self.scope.pop()
+        self._pop()
 
     def visit_if_stmt(self, o):
-        self.scope.append(o)
+        self._push(o)
         super().visit_if_stmt(o)
-        self.scope.pop()
+        self._pop()
 
     def visit_for_stmt(self, o):
-        self.scope.append(o)
+        self._push(o)
         super().visit_for_stmt(o)
-        self.scope.pop()
+        self._pop()
 
     def visit_while_stmt(self, o):
-        self.scope.append(o)
+        self._push(o)
         super().visit_while_stmt(o)
-        self.scope.pop()
+        self._pop()
 
     def visit_with_stmt(self, o):
-        self.scope.append(o)
+        self._push(o)
         super().visit_with_stmt(o)
-        self.scope.pop()
+        self._pop()
 
     def traverse_scope(self) -> Iterator[Tuple[Statement, int]]:
         """Traverse the current scope upwards."""
-        level = 1
-        for scope in reversed(self.scope):
-            yield scope, level
-            level += 1
+        frame = self.frame
+        while frame:
+            yield frame.stmt, self.frame.depth - frame.depth + 1  # type: ignore
+            frame = frame.parent
 
     def determine_current_node(self, fallback: SymbolNode) -> SymbolNode:
         """Determine the current node, that is a function or class. The fallback is used if not
         in a function nor in a class definition.
         """
-        for stmt, _ in self.traverse_scope():
-            if isinstance(stmt, (FuncDef, ClassDef)):
-                return stmt
-
-        return fallback
+        return self.frame.node if self.frame and self.frame.node else fallback
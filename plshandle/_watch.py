@@ -0,0 +1,70 @@
+"""Check contracts again whenever files of the checked modules change."""
+
+import os
+import sys
+import time
+from typing import Callable, Dict, Optional, TextIO, Tuple
+
+from mypy.options import Options
+
+from plshandle._cli import CLIResult, _streamed_output
+from plshandle._cli_utils.config import Config
+from plshandle._cli_utils.print_output import print_output
+from plshandle._session import Session
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None  # removed
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Watcher:
+    """Check the modules of ``config`` using a ``Session`` whenever one of their files changes or
+    a file is added to or removed from one of their directories. Polls the modification time and
+    size of these files and directories every ``interval`` seconds.
+    """
+
+    def __init__(
+        self, config: Config, mypy_options: Callable[[], Options] = Options, interval: float = 0.25
+    ):
+        self.config = config
+        self.interval = interval
+        self.session = Session(mypy_options)
+        self._stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def _snapshot(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        return {path: _stamp(path) for path in self._stamps}
+
+    def check(self) -> CLIResult:
+        """Check the modules affected by changes since the last check (all modules on the first
+        call) and remember the state of their files.
+        """
+        output = self.session.check_config(self.config)
+        with _streamed_output(self.config) as on_result:
+            for result in output.results if on_result else ():
+                on_result(result)
+        paths = [source.path for source in output.modules if source.path]
+        directories = [os.path.dirname(path) for path in paths] + list(self.config.directory or [])
+        self._stamps = {path: _stamp(path) for path in dict.fromkeys(paths + directories)}
+        return output
+
+    def changed(self) -> bool:
+        """Whether any of the watched files or directories changed since the last check."""
+        return self._snapshot() != self._stamps
+
+    def run(self, stdout: TextIO = sys.stdout, stderr: TextIO = sys.stderr) -> int:
+        """Check, print the output and wait for changes until interrupted. Returns the exit code
+        of the last check.
+        """
+        exit_code = 20
+        try:
+            while True:
+                exit_code = print_output(self.check(), stdout, stderr)
+                print("Watching for file changes, press Ctrl+C to stop", file=stderr, flush=True)
+                while not self.changed():
+                    time.sleep(self.interval)
+        except KeyboardInterrupt:
+            return exit_code
@@ -0,0 +1,248 @@
+"""Mypy plugin checking contracts during mypy's own type checking, enable it in your mypy config:
+
+.. code-block:: ini
+
+   [mypy]
+   plugins = plshandle.plugin
+
+Violated contracts are reported as mypy errors, so there is no second build by ``plshandle``.
+"""
+
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from mypy.checker import TypeChecker
+from mypy.nodes import (
+    CallExpr,
+    Decorator,
+    Expression,
+    FuncDef,
+    MemberExpr,
+    MypyFile,
+    RefExpr,
+    Statement,
+    SymbolNode,
+    TryStmt,
+    TupleExpr,
+    TypeAlias,
+    TypeInfo,
+    Var,
+)
+from mypy.plugin import FunctionContext, MethodContext, Plugin
+from mypy.types import CallableType, Instance, Type as MypyType, get_proper_type
+
+from plshandle._ast_utils.resolve_called_functions import (
+    MethodCache,
+    _get_function_from_node,
+    _resolve_bound_functions,
+    _resolve_unbound_function,
+)
+from plshandle._ast_utils.resolve_contract import _PLSHANDLE_QUALIFIER
+from plshandle._ast_utils.resolve_exception_types import ExceptionIndex
+from plshandle._cli_utils.config import Config, read_and_merge_config
+from plshandle._visitors.alias_resolver import AliasResolver
+from plshandle._visitors.scope_tracker import ScopeFrame, ScopeTracker
+
+
+def _exception_types(expr: Expression, index: ExceptionIndex) -> Iterator[TypeInfo]:
+    # the type maps of other modules are gone once they are checked, so resolve the exception
+    # types from the nodes, e.g. KeyError or (KeyError, module.CustomError)
+    if isinstance(expr, TupleExpr):
+        for item in expr.items:
+            yield from _exception_types(item, index)
+    elif isinstance(expr, RefExpr):
+        node = expr.node
+        if isinstance(node, TypeAlias):  # e.g. ``AliasedError = CustomError``
+            target = get_proper_type(node.target)
+            node = target.type if isinstance(target, Instance) else None
+        if isinstance(node, TypeInfo) and index.is_exception_type(node):
+            yield node
+
+
+class _CheckerTypes:
+    # type map of the module being checked, in the form resolve_called_functions expects it
+    def __init__(self, checker: TypeChecker):
+        self._checker = checker
+
+    def __getitem__(self, expr: Expression) -> MypyType:
+        return self._checker.lookup_type(expr)  # raises KeyError just like a dict
+
+
+class _CallMap(ScopeTracker, AliasResolver):
+    # scope and alias resolved function (if any) of each call expression of a module, in the same
+    # form as ContractChecker sees them. Aliases of other modules are passed to ``resolve_other``.
+    def __init__(self, tree: MypyFile, resolve_other: Callable[[SymbolNode], SymbolNode]):
+        super().__init__()
+        self.calls: Dict[CallExpr, Tuple[Optional[ScopeFrame], Optional[FuncDef]]] = {}
+        self._resolve_other = resolve_other
+        self.visit_mypy_file(tree)
+
+    def resolve_alias(self, alias: SymbolNode):
+        return self._resolve_other(super().resolve_alias(alias))
+
+    def visit_call_expr(self, o: CallExpr):
+        super().visit_call_expr(o)
+        self.calls[o] = (self.frame, _resolve_unbound_function(o.callee, self))
+
+
+class PlshandlePlugin(Plugin):
+    """Report calls of contract functions not handling or propagating all exceptions of the
+    contract, the same way ``python -m plshandle`` does. Calls through receivers of a union type
+    are not checked, since mypy does not pass them to plugins.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        config = read_and_merge_config(Config())
+        self.strict = config.strict
+        self.match_subclasses = config.match_subclasses
+        self._exceptions = ExceptionIndex()
+        self._contracts: Dict[FuncDef, Tuple[TypeInfo, ...]] = {}
+        self._claimed: Dict[str, bool] = {}
+        self._tree: Optional[MypyFile] = None
+        self._calls: Dict[CallExpr, Tuple[Optional[ScopeFrame], Optional[FuncDef]]] = {}
+        self._methods = MethodCache()
+
+    def _contract_of(self, function: FuncDef) -> Tuple[TypeInfo, ...]:
+        # exception types of the contract of a function, memoized per function
+        try:
+            return self._contracts[function]
+        except KeyError:
+            pass
+
+        types: Tuple[TypeInfo, ...] = ()
+        if function.is_decorated:
+            symbol = self.lookup_fully_qualified(function.fullname)
+            if symbol and isinstance(symbol.node, Decorator):
+                types = self._contract(symbol.node)
+        self._contracts[function] = types
+        return types
+
+    def _contract(self, decorator: Decorator) -> Tuple[TypeInfo, ...]:
+        # exception types of all plshandle decorators of a decorated function
+        types: Dict[TypeInfo, None] = {}
+        for call in decorator.decorators:
+            if isinstance(call, CallExpr) and isinstance(call.callee, RefExpr):
+                node = self._resolve_alias(call.callee.node)
+                function = _get_function_from_node(node)
+                if function and function.fullname == _PLSHANDLE_QUALIFIER:
+                    for arg in call.args:
+                        types.update(dict.fromkeys(_exception_types(arg, self._exceptions)))
+        return tuple(types)
+
+    @staticmethod
+    def _resolve_alias(node: Optional[SymbolNode], current: str = "") -> Optional[SymbolNode]:
+        # mypy frees the statements of checked modules, so aliases like ``alias = function`` of
+        # modules other than ``current`` are resolved by their inferred type
+        if isinstance(node, Var) and node.fullname.rpartition(".")[0] != current:
+            type_ = get_proper_type(node.type)
+            if isinstance(type_, CallableType) and isinstance(type_.definition, FuncDef):
+                return type_.definition
+        return node
+
+    def _may_call_contract(self, fullname: str) -> bool:
+        # whether calls of ``fullname`` need to be resolved, memoized per fullname. Only claim
+        # hooks that are needed, since the first plugin claiming a hook shadows the others.
+        try:
+            return self._claimed[fullname]
+        except KeyError:
+            pass
+
+        symbol = self.lookup_fully_qualified(fullname)
+        node = symbol.node if symbol else None
+        if node is None or isinstance(node, Var):
+            claimed = True  # local names, inherited methods and aliases
+        elif isinstance(node, TypeInfo):
+            claimed = any(
+                self._contract_of(method)
+                for method in (
+                    self._methods.method(node, "__init__"),
+                    self._methods.method(node, "__call__"),
+                )
+                if method
+            )
+        else:
+            function = _get_function_from_node(node)
+            claimed = bool(function and self._contract_of(function))
+        self._claimed[fullname] = claimed
+        return claimed
+
+    def _call(
+        self, checker: TypeChecker, call: CallExpr
+    ) -> Tuple[Optional[ScopeFrame], Optional[FuncDef]]:
+        if checker.tree is not self._tree:
+            self._tree = checker.tree
+            module = checker.tree.fullname
+            self._calls = _CallMap(
+                checker.tree, lambda node: self._resolve_alias(node, module)
+            ).calls
+        return self._calls.get(call, (None, None))
+
+    def _resolve_types(self, stmt: Statement) -> Optional[Tuple[bool, FrozenSet[TypeInfo]]]:
+        # exception types handled by a try statement or propagated by a decorator, the frames
+        # memoize them
+        if isinstance(stmt, TryStmt):
+            return False, frozenset(
+                t for expr in stmt.types if expr for t in _exception_types(expr, self._exceptions)
+            )
+        if isinstance(stmt, Decorator):
+            return True, frozenset(self._contract(stmt))
+        return None
+
+    def _check(self, ctx: Union[FunctionContext, MethodContext]) -> MypyType:
+        checker = cast(TypeChecker, ctx.api)
+        if checker.tree.is_stub or not isinstance(ctx.context, CallExpr):
+            return ctx.default_return_type  # stubs do not call anything at runtime
+
+        callee = ctx.context.callee
+        frame, function = self._call(checker, ctx.context)
+        if function:
+            functions: Iterable[FuncDef] = (function,)
+        elif isinstance(ctx, MethodContext):
+            # the type of the receiver, mypy temporarily stores the method type for ``instance()``
+            receiver = callee.expr if isinstance(callee, MemberExpr) else callee
+            functions = _resolve_bound_functions(callee, {receiver: ctx.type}, self._methods)
+        else:
+            functions = _resolve_bound_functions(callee, _CheckerTypes(checker), self._methods)
+        for function in functions:
+            for exception in self._contract_of(function):
+                message = self._check_exception(exception, frame)
+                if message:
+                    message = message.format(func=function.fullname, exc=exception.fullname)
+                    ctx.api.fail(message, ctx.context)
+        return ctx.default_return_type
+
+    def _check_exception(self, exception: TypeInfo, frame: Optional[ScopeFrame]) -> Optional[str]:
+        # same as ContractChecker._check_exception() followed by collect_errors()
+        exceptions = frame.exceptions(self._resolve_types) if frame else {}
+        candidates = exception.mro if self.match_subclasses else (exception,)
+        nearest = max(
+            (exceptions[type_] for type_ in candidates if type_ in exceptions), default=None
+        )
+        if nearest is None or (nearest[1] and self.strict):
+            # propagated, but strict mode requires handling it
+            return "Violated contract of {func}. Not handled nor propagated {exc}"
+        if not nearest[1] and self.strict and frame.depth - nearest[0] != 0:  # type: ignore
+            return "{exc} not handled at level 1"
+        return None
+
+    def get_function_hook(self, fullname: str) -> Optional[Callable[[FunctionContext], MypyType]]:
+        return self._check if self._may_call_contract(fullname) else None
+
+    def get_method_hook(self, fullname: str) -> Optional[Callable[[MethodContext], MypyType]]:
+        return self._check if self._may_call_contract(fullname) else None
+
+
+def plugin(version: str) -> Type[Plugin]:  # pylint: disable=unused-argument
+    """Entry point of the mypy plugin."""
+    return PlshandlePlugin
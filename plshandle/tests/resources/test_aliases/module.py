@@ -0,0 +1,33 @@
+from plshandle import plshandle
+
+
+@plshandle(KeyError)
+def foo():
+    pass
+
+
+def bar():
+    pass
+
+
+alias = foo
+other = alias
+alias = other  # cyclic alias chain, resolution must terminate
+alias()  # no report created, cannot be resolved
+
+
+def shadowing():
+    global other
+    other = foo  # shadows the module scope alias while in this function
+    other()  # violation
+
+    def nested():
+        local = bar
+        local = foo  # reassigned in the same scope
+        local()  # violation
+
+    nested()
+
+
+other = bar
+other()  # no report created, other refers to bar again
@@ -0,0 +1,37 @@
+from plshandle import plshandle
+
+
+@plshandle(KeyError)
+def foo():
+    pass
+
+
+def bar():
+    foo()  # propagated with --infer, KeyError escapes bar
+
+
+def baz():
+    try:
+        bar()  # handled, nothing escapes baz
+    except KeyError:
+        pass
+
+
+def even(number):
+    if number:
+        return odd(number - 1)  # propagated with --infer, even and odd call each other
+    bar()  # propagated with --infer
+    return True
+
+
+def odd(number):
+    return even(number - 1)  # propagated with --infer
+
+
+@plshandle(ValueError)
+def qux():
+    bar()  # error with --infer: KeyError escapes bar, but qux only propagates ValueError
+
+
+baz()
+odd(1)  # error with --infer: KeyError escapes odd
@@ -0,0 +1,27 @@
+from plshandle import plshandle
+
+
+class CustomError(LookupError):
+    pass
+
+
+@plshandle(KeyError, CustomError)
+def foo():
+    pass
+
+
+try:
+    foo()  # o.k. with --match-subclasses, LookupError is a base class of both
+except LookupError:
+    pass
+
+
+@plshandle(LookupError)
+def bar():
+    foo()  # o.k. with --match-subclasses, propagated as LookupError
+
+
+try:
+    foo()  # error: did not handle CustomError, ValueError is not a base class of it
+except (KeyError, ValueError):
+    pass
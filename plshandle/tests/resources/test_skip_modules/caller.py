@@ -0,0 +1,6 @@
+from test_skip_modules.reexport import foo, make_bar
+
+
+def call():
+    foo()  # error: imported through a re-export
+    make_bar().method()  # error: contracts module is not imported at all
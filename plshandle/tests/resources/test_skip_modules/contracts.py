@@ -0,0 +1,12 @@
+from plshandle import plshandle
+
+
+@plshandle(KeyError)
+def foo():
+    pass
+
+
+class Bar:
+    @plshandle(ValueError)
+    def method(self):
+        pass
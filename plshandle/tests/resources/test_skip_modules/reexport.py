@@ -0,0 +1,5 @@
+from test_skip_modules.contracts import Bar, foo
+
+
+def make_bar() -> Bar:
+    return Bar()
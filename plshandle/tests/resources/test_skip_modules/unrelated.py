@@ -0,0 +1,6 @@
+def foo():
+    pass
+
+
+def call():
+    foo()  # no contract, module is skipped
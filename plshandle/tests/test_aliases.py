@@ -0,0 +1,23 @@
+"""Test alias resolution across scopes, including reassignments and cyclic aliases."""
+
+from plshandle.tests import cli, transform_results, Result, Contract
+
+
+def test_aliases():
+    """Assert that contracts are handled as described in resources/test_aliases/module.py."""
+    args = ["-m", "test_aliases.module"]
+    contracts = transform_results(cli(args).results)
+    assert contracts == {
+        Contract(
+            function="test_aliases.module.foo",
+            scope="test_aliases.module.shadowing",
+            line=22,
+            results=(Result("builtins.KeyError", is_propagated=False, is_handled=False, level=0),),
+        ),
+        Contract(
+            function="test_aliases.module.foo",
+            scope="nested",
+            line=27,
+            results=(Result("builtins.KeyError", is_propagated=False, is_handled=False, level=0),),
+        ),
+    }
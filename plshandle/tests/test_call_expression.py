@@ -6,7 +6,8 @@ from plshandle.tests import cli, transform_results, Result, Contract
 def test_call_expression():
     """Assert that contracts are checked if the callee is a call expression itself."""
     args = ["-m", "test_call_expression.module"]
-    contracts = transform_results(cli(args).results)
+    output = cli(args)
+    contracts = transform_results(output.results)
     assert contracts == {
         Contract(
             function="test_call_expression.module.Foo.method",
@@ -21,3 +22,7 @@ def test_call_expression():
             results=(Result("builtins.KeyError", is_propagated=False, is_handled=True, level=1,),),
         ),
     }
+
+    # Foo() and .method() are each called twice, the second calls are resolved from the cache
+    assert output.statistics["method cache hits"] == 4
+    assert output.statistics["method cache misses"] == 6
@@ -0,0 +1,54 @@
+"""Test that only modules affected by changed files are checked, reusing the cached results of
+all others.
+"""
+
+import subprocess
+
+from mypy.options import Options
+
+from plshandle import cli
+from plshandle._changed_modules import changed_files_since
+from plshandle.tests import transform_results, resource
+
+
+def _cached_cli(args, cache_dir):
+    options = Options()
+    options.cache_dir = str(cache_dir)
+    return cli(args, options)
+
+
+def test_changed_files(tmp_path):
+    """Assert that unaffected modules are not checked again and the results stay the same."""
+    args = ["-m", "test_simple.module", "-m", "test_aliases.module"]
+    full = _cached_cli(args, tmp_path)
+    _cached_cli(args, tmp_path)  # mypy's cache settles after the first run
+
+    changed = str(resource("test_simple", "module.py"))
+    partial = _cached_cli(args + ["--changed-files", changed], tmp_path)
+    assert partial.statistics["affected modules"] == 1
+    assert partial.statistics["result store hits"] == 1
+    assert [result.source.module for result in partial.results] == [
+        result.source.module for result in full.results
+    ]
+    assert transform_results(partial.results) == transform_results(full.results)
+
+
+def test_changed_files_since(tmp_path, monkeypatch):
+    """Assert that committed, uncommitted and untracked changes are found."""
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=str(tmp_path), check=True, stdout=subprocess.PIPE)
+
+    git("init", "-q")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "test")
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text("")
+    git("add", "a.py", "b.py", "c.py")
+    git("commit", "-q", "-m", "initial")
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "d.py").write_text("")
+
+    monkeypatch.chdir(tmp_path)
+    changed = {path.rsplit("/", 1)[-1] for path in changed_files_since("HEAD")}
+    assert changed == {"a.py", "d.py"}
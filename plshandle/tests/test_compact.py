@@ -0,0 +1,54 @@
+"""Test that ``--compact`` yields the same output as a normal run, but without mypy nodes."""
+
+import pytest
+from mypy.options import Options
+
+from plshandle._cache import MypyCache
+from plshandle._cli_utils.build_json import build_json
+from plshandle._cli_utils.collect_errors import collect_errors
+from plshandle._cli_utils.determine_exit_code import determine_exit_code
+from plshandle._gather_modules import gather_modules
+from plshandle._visitors.contract_checker import ContractChecker
+from plshandle._visitors.contract_collector import ContractCollector
+from plshandle.tests import cli, transform_results
+
+
+def test_compact():
+    """Assert that only records are kept and that JSON, errors and exit code are identical."""
+    args = ["-p", "test_simple", "-p", "test_unions", "-p", "test_skip_modules"]
+    normal = cli(args)
+    compact = cli(args + ["--compact"])
+
+    assert not compact.results
+    assert compact.records == normal.records
+    assert build_json(compact.records) == build_json(normal.records)
+    assert list(collect_errors(compact)) == list(collect_errors(normal))
+    assert determine_exit_code(compact) == determine_exit_code(normal)
+
+
+def test_release():
+    """Assert that releasing each checked module does not change the results of the modules
+    checked after it, and that only the trees and type map entries are dropped.
+    """
+    options = Options()
+    options.incremental = False
+    modules = list(gather_modules([], ["test_simple", "test_unions", "test_aliases"], [], []))
+    cache = MypyCache(modules, options)
+    contracts = ContractCollector(modules, cache).contracts
+    expected = transform_results(ContractChecker(contracts, modules, cache).results)
+    types = len(cache.build.types)
+
+    results = ContractChecker(contracts, modules, cache, release=True).results
+    assert transform_results(results) == expected
+    assert all(not cache.build.files[source.module].defs for source in modules)
+    assert len(cache.build.types) < types
+
+
+def test_release_fine_grained():
+    """Assert that modules of a fine-grained build cannot be released."""
+    modules = list(gather_modules([], ["test_simple"], [], []))
+    options = Options()
+    options.incremental = False
+    cache = MypyCache(modules, options, fine_grained=True)
+    with pytest.raises(ValueError):
+        cache.release(modules[0].module)
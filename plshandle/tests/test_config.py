@@ -8,12 +8,23 @@ from plshandle._cli_utils.config import Config
 
 def test_config():
     """Assert that merging config file and CLI args works as intended."""
-    result = cli(["-p", "test_simple", "--config", str(resource("test_config", "config.toml"))])
+    result = cli(
+        [
+            "-p",
+            "test_simple",
+            "--exclude",
+            "*_pb2.py",
+            "--config",
+            str(resource("test_config", "config.toml")),
+        ]
+    )
     assert result.config == Config(
         config=str(resource("test_config", "config.toml")),
         directory=[],
         package=["test_unions", "test_simple"],
         module=[],
+        exclude=["*/tests", "*_pb2.py"],
+        include=[],
         strict=True,
         json=False,
         verbose=True,
@@ -44,3 +55,9 @@ def test_invalid_boolean():
     """Assert that TypeError is raised if a boolean config entry is not a boolean."""
     with pytest.raises(TypeError):
         cli(["--config", str(resource("test_config", "invalid_bool.toml"))])
+
+
+def test_invalid_integer():
+    """Assert that TypeError is raised if an integer config entry is not an integer."""
+    with pytest.raises(TypeError):
+        cli(["--config", str(resource("test_config", "invalid_int.toml"))])
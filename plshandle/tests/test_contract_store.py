@@ -0,0 +1,35 @@
+"""Test that contracts are persisted in mypy's cache directory and reused on subsequent runs."""
+
+from mypy.options import Options
+
+from plshandle import cli
+from plshandle.tests import transform_results
+
+
+def _cached_cli(args, cache_dir):
+    options = Options()
+    options.cache_dir = str(cache_dir)
+    return cli(args, options)
+
+
+def test_contract_store(tmp_path):
+    """Assert that unchanged modules are not collected again and yield the same contracts."""
+    args = ["-p", "test_advanced", "-m", "test_simple.module"]
+    first = _cached_cli(args, tmp_path)
+    assert (tmp_path / "plshandle" / "contracts.json").exists()
+    assert first.statistics["contract store hits"] == 0
+
+    # mypy's cache settles after the first run, from then on everything is reused
+    _cached_cli(args, tmp_path)
+    last = _cached_cli(args, tmp_path)
+    assert last.statistics["contract store hits"] == len(last.modules)
+    assert last.statistics["contract store misses"] == 0
+
+    def contracts(output):
+        return [
+            (c.function.fullname, [t.fullname for t in c.exception_types], c.source.module)
+            for c in output.contracts
+        ]
+
+    assert contracts(last) == contracts(first)
+    assert transform_results(last.results) == transform_results(first.results)
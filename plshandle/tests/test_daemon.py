@@ -0,0 +1,111 @@
+"""Test that the daemon only re-checks modules affected by changed files."""
+
+import os
+import threading
+import time
+
+import pytest
+from mypy.options import Options
+
+from plshandle._daemon import NOT_RUNNING, Workspace, daemon_main, request, serve
+
+LIB = """from plshandle import plshandle
+
+
+@plshandle(KeyError)
+def foo():
+    pass
+"""
+
+CALLER = """from {}.lib import foo
+
+
+def bar():
+    foo()
+"""
+
+HANDLING_CALLER = """from {}.lib import foo
+
+
+def bar():
+    try:
+        foo()
+    except KeyError:
+        pass
+"""
+
+
+def _options():
+    options = Options()
+    options.incremental = False
+    options.cache_dir = os.devnull
+    return options
+
+
+def _make_package(tmp_path, monkeypatch, name):
+    package = tmp_path / name
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "lib.py").write_text(LIB)
+    (package / "caller.py").write_text(CALLER.format(name))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return package
+
+
+def _handled(result):
+    return [
+        exception.is_handled
+        for module in result.results
+        for report in module.reports
+        for exception in report.results
+    ]
+
+
+def test_workspace(tmp_path, monkeypatch):
+    """Assert that a changed module is checked again while all others are reused."""
+    package = _make_package(tmp_path, monkeypatch, "daemon_workspace")
+    workspace = Workspace(_options)
+
+    first = workspace.check(["-p", "daemon_workspace"])
+    assert first.statistics["checked modules"] == 2
+    assert _handled(first) == [False]
+
+    (package / "caller.py").write_text(HANDLING_CALLER.format("daemon_workspace"))
+    second = workspace.check(["-p", "daemon_workspace"])
+    assert second.statistics["checked modules"] == 1
+    assert second.statistics["reused contracts"] == 1
+    assert _handled(second) == [True]
+    assert [result.source.module for result in second.results] == [
+        result.source.module for result in first.results
+    ]
+
+    output = tmp_path / "results.ndjson"
+    args = ["-p", "daemon_workspace", "--output-format", "ndjson", "--output", str(output)]
+    third = workspace.check(args)
+    assert third.statistics["checked modules"] == 0
+    assert _handled(third) == [True]
+    assert len(output.read_text().splitlines()) == 1
+
+
+def test_server(tmp_path, monkeypatch, capsys):
+    """Assert that checks are served over the socket until the daemon is stopped."""
+    _make_package(tmp_path, monkeypatch, "daemon_server")
+    path = str(tmp_path / "daemon.sock")
+    assert daemon_main(["--socket", path, "status"]) == NOT_RUNNING
+
+    thread = threading.Thread(target=serve, args=(path, Workspace(_options)), daemon=True)
+    thread.start()
+    while not os.path.exists(path):
+        time.sleep(0.01)
+
+    try:
+        assert request(path, {"command": "status"})["pid"] == os.getpid()
+        with pytest.raises(RuntimeError):
+            serve(path)  # already running
+        assert daemon_main(["--socket", path, "status"]) == 0
+        assert daemon_main(["--socket", path, "check", "-p", "daemon_server"]) == 1
+    finally:
+        assert daemon_main(["--socket", path, "stop"]) == 0
+    thread.join()
+    assert not os.path.exists(path)
+    assert "daemon_server.lib.foo" in capsys.readouterr().err
@@ -1,9 +1,11 @@
 """Checks whether or not all the packages, subpackages and modules are found."""
 
+import os
 from pathlib import Path
 
 import pytest
 
+from plshandle._gather_modules import DirectoryCache, ModuleFilter, gather_modules
 from plshandle.tests import cli, resource
 
 
@@ -28,6 +30,16 @@ def test_find_modules():
     }
 
 
+def test_exclude():
+    """Assert that excluded packages are not scanned and reported in the statistics."""
+    output = cli(["-d", str(resource("test_find_modules", "dir")), "--exclude", "package2"])
+    assert {Path(x.path) for x in output.modules} == {
+        resource("test_find_modules", "dir", "package1", "module1.py"),
+        resource("test_find_modules", "dir", "package1", "module2.py"),
+    }
+    assert output.statistics["excluded packages"] == 1
+
+
 def test_invalid_package():
     """Assert that FNF is raised if a package cannot be found."""
     with pytest.raises(FileNotFoundError):
@@ -38,3 +50,62 @@ def test_invalid_module():
     """Assert that MNF is raised if a module cannot be found."""
     with pytest.raises(ModuleNotFoundError):
         cli(["-m", "invalidpackage.invalidmodule"])
+
+
+def _gather(directories, cache):
+    return [(x.module, Path(x.path)) for x in gather_modules(directories, [], [], [], cache)]
+
+
+def test_directory_cache(tmp_path):
+    """Assert that listings are reused until a directory changes and that several directories
+    scanned concurrently keep their order.
+    """
+    package = tmp_path / "cached_package"
+    package.mkdir()
+    (package / "module1.py").write_text("")
+    directories = [str(tmp_path), str(resource("test_find_modules", "dir"))]
+    cache = DirectoryCache()
+
+    first = _gather(directories, cache)
+    assert first[0] == ("cached_package.module1", package / "module1.py")
+    assert first[1:] == _gather(directories[1:], DirectoryCache())
+    hits, misses = cache.hits, cache.misses
+
+    assert _gather(directories, cache) == first
+    assert (cache.hits, cache.misses) == (2 * hits + misses, misses)
+
+    (package / "module0.py").write_text("")
+    os.utime(package, ns=(0, 0))  # the modification time changes, even on coarse file systems
+    assert _gather(directories, cache)[:2] == [
+        ("cached_package.module0", package / "module0.py"),
+        ("cached_package.module1", package / "module1.py"),
+    ]
+    assert cache.misses == misses + 1
+
+
+def test_module_filter(tmp_path):
+    """Assert that excluded, large and generated modules are skipped and counted."""
+    package = tmp_path / "filtered_package"
+    (package / "tests").mkdir(parents=True)
+    (package / "tests" / "test_module.py").write_text("")
+    (package / "module.py").write_text("")
+    (package / "large.py").write_text("x = 0\n" * 100)
+    (package / "module_pb2.py").write_text(
+        "# Generated by the protocol buffer compiler.  DO NOT EDIT!\n"
+    )
+    (package / "other_pb2.py").write_text("")
+
+    module_filter = ModuleFilter(["*/tests", "*/other_pb2.py"], [], 100, True)
+    modules = gather_modules([str(tmp_path)], [], [], [], None, module_filter)
+    assert [module.module for module in modules] == ["filtered_package.module"]
+    assert module_filter.skipped == {
+        "excluded packages": 1,
+        "excluded modules": 1,
+        "large modules": 1,
+        "generated modules": 1,
+    }
+
+    module_filter = ModuleFilter([], ["*/l*.py"])
+    modules = gather_modules([str(tmp_path)], [], [], [], None, module_filter)
+    assert [module.module for module in modules] == ["filtered_package.large"]
+    assert module_filter.skipped == {"excluded modules": 4}
@@ -0,0 +1,83 @@
+"""Test that contracts of functions letting exceptions of contracts escape are inferred."""
+
+import os
+
+from mypy.options import Options
+
+from plshandle import Session
+from plshandle._cli_utils.collect_errors import collect_errors
+from plshandle._cli_utils.config import Config
+from plshandle._inference import strongly_connected_components
+from plshandle.tests import cli, transform_results, Result, Contract
+
+MODULE = "test_infer.module"
+KEY_ERROR = "builtins.KeyError"
+
+
+def _contract(function: str, scope: str, line: int, *result) -> Contract:
+    return Contract(
+        function="{}.{}".format(MODULE, function),
+        scope="{}.{}".format(MODULE, scope) if scope else MODULE,
+        line=line,
+        results=(Result(KEY_ERROR, *result),),
+    )
+
+
+def test_infer():
+    """Assert that contracts are only inferred with ``--infer``, as described in
+    resources/test_infer/module.py.
+    """
+    output = cli(["-m", MODULE])
+    assert transform_results(output.results) == {_contract("foo", "bar", 10, False, False, 0)}
+
+    output = cli(["-m", MODULE, "--infer"])
+    inferred = [c for c in output.contracts if c.inferred]
+    assert [(c.function.name, [t.fullname for t in c.exception_types]) for c in inferred] == [
+        ("bar", [KEY_ERROR]),
+        ("even", [KEY_ERROR]),
+        ("odd", [KEY_ERROR]),
+    ]
+    assert output.statistics["inferred contracts"] == 3
+    assert transform_results(output.results) == {
+        _contract("foo", "bar", 10, True, False, 0),
+        _contract("bar", "baz", 15, False, True, 1),
+        _contract("odd", "even", 22, True, False, 0),
+        _contract("bar", "even", 23, True, False, 0),
+        _contract("even", "odd", 28, True, False, 0),
+        _contract("bar", "qux", 33, False, False, 0),
+        _contract("odd", None, 37, False, False, 0),
+    }
+    assert [error.split(": ", 1)[1] for error in collect_errors(output)] == [
+        "Violated inferred contract of test_infer.module.bar. Not handled nor propagated "
+        "builtins.KeyError",
+        "Violated inferred contract of test_infer.module.odd. Not handled nor propagated "
+        "builtins.KeyError",
+    ]
+
+
+def test_infer_session():
+    """Assert that a session reuses the inferred contracts if nothing changed."""
+    options = Options()
+    options.incremental = False
+    options.cache_dir = os.devnull
+    session = Session(lambda: options)
+    config = Config(module=[MODULE], infer=True)
+
+    first = session.check_config(config)
+    assert first.statistics["inferred contracts"] == 3
+    assert first.statistics["reused call graph components"] == 0
+
+    second = session.check_config(config)
+    assert second.statistics["inferred contracts"] == 3
+    assert second.statistics["recomputed call graph components"] == 0
+    assert second.statistics["reused call graph components"] == (
+        first.statistics["recomputed call graph components"]
+    )
+    assert transform_results(second.results) == transform_results(first.results)
+
+
+def test_strongly_connected_components():
+    """Assert that components are yielded callees first and that cycles form one component."""
+    graph = {"a": ["b"], "b": ["c", "a"], "c": ["d"], "d": ["c"], "e": ["e", "a"]}
+    components = [sorted(c) for c in strongly_connected_components(graph)]  # type: ignore
+    assert components == [["c", "d"], ["a", "b"], ["e"]]
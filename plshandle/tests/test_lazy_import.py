@@ -0,0 +1,33 @@
+"""Test that the decorator can be used without importing mypy and the rest of the CLI."""
+
+import subprocess
+import sys
+
+import plshandle
+
+
+def test_decorator_does_not_import_mypy():
+    """Assert that importing the decorator does not import any of the CLI dependencies."""
+    code = (
+        "import sys\n"
+        "from plshandle import plshandle\n"
+        "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    loaded = set(output.stdout.split())
+    assert not loaded & {"mypy", "setuptools", "toml"}
+
+
+def test_lazy_attributes():
+    """Assert that the lazily imported attributes resolve to the actual objects."""
+    from plshandle._cli import cli  # pylint: disable=import-outside-toplevel
+
+    assert plshandle.cli is cli
+    assert "CheckResult" in dir(plshandle)
+
+
+def test_unknown_attribute():
+    """Assert that accessing an unknown attribute still raises AttributeError."""
+    assert not hasattr(plshandle, "does_not_exist")
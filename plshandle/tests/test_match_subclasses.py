@@ -0,0 +1,52 @@
+"""Test that handling or propagating a base class of an exception fulfills the contract."""
+
+import pytest
+
+from plshandle.tests import cli, transform_results, Result, Contract
+
+KEY_ERROR = "builtins.KeyError"
+CUSTOM_ERROR = "test_match_subclasses.module.CustomError"
+
+
+def _contracts(handled_14: bool, propagated_21: bool):
+    return {
+        Contract(
+            function="test_match_subclasses.module.foo",
+            scope="test_match_subclasses.module",
+            line=14,
+            results=(
+                Result(KEY_ERROR, False, handled_14, 1 if handled_14 else 0),
+                Result(CUSTOM_ERROR, False, handled_14, 1 if handled_14 else 0),
+            ),
+        ),
+        Contract(
+            function="test_match_subclasses.module.foo",
+            scope="test_match_subclasses.module.bar",
+            line=21,
+            results=(
+                Result(KEY_ERROR, propagated_21, False, 0),
+                Result(CUSTOM_ERROR, propagated_21, False, 0),
+            ),
+        ),
+        Contract(
+            function="test_match_subclasses.module.foo",
+            scope="test_match_subclasses.module",
+            line=25,
+            results=(
+                Result(KEY_ERROR, False, True, 1),
+                Result(CUSTOM_ERROR, False, False, 0),
+            ),
+        ),
+    }
+
+
+@pytest.mark.parametrize("match_subclasses", [False, True], ids=["exact", "subclasses"])
+def test_match_subclasses(match_subclasses):
+    """Assert that base classes only match with ``--match-subclasses``, as described in
+    resources/test_match_subclasses/module.py.
+    """
+    args = ["-m", "test_match_subclasses.module"]
+    if match_subclasses:
+        args.append("--match-subclasses")
+    contracts = transform_results(cli(args).results)
+    assert contracts == _contracts(match_subclasses, match_subclasses)
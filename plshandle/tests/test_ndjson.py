@@ -0,0 +1,25 @@
+"""Test that NDJSON output contains the same reports as the JSON output, in the same order."""
+
+import json
+
+from plshandle._cli_utils.build_json import build_json
+from plshandle.tests import cli
+
+
+def test_ndjson(tmp_path):
+    """Assert that each report of the JSON array is written as one line, including its source,
+    no matter whether modules are checked in this or in worker processes.
+    """
+    args = ["-p", "test_simple", "-p", "test_skip_modules", "-p", "test_aliases"]
+    output = tmp_path / "results.ndjson"
+    for jobs in ("1", "2"):
+        result = cli(args + ["--output-format", "ndjson", "--output", str(output), "--jobs", jobs])
+
+        expected = [
+            {"source": module["source"], **report}
+            for module in json.loads(build_json(result.records))
+            for report in module["reports"]
+        ]
+        lines = output.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == expected
+        assert len(lines) == sum(len(module.reports) for module in result.results) > 0
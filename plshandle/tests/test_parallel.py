@@ -0,0 +1,20 @@
+"""Test that checking modules in parallel yields the same output as checking them serially."""
+
+from plshandle._cli_utils.build_json import build_json
+from plshandle._cli_utils.collect_errors import collect_errors
+from plshandle.tests import cli
+
+
+def test_parallel():
+    """Assert that results, JSON and errors are identical and in the same order."""
+    args = ["-p", "test_simple", "-p", "test_unions", "-p", "test_aliases", "-p", "test_subclasses"]
+    serial = cli(args)
+    parallel = cli(args + ["--jobs", "2"])
+
+    assert parallel.statistics["jobs"] == 2
+    assert [result.source.module for result in parallel.results] == [
+        result.source.module for result in serial.results
+    ]
+    assert build_json(parallel.records) == build_json(serial.records)
+    assert list(collect_errors(parallel)) == list(collect_errors(serial))
+    assert parallel.statistics["handler cache misses"] == serial.statistics["handler cache misses"]
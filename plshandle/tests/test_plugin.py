@@ -0,0 +1,56 @@
+"""Test that the mypy plugin reports the same violations as the command line interface."""
+
+import os
+from pathlib import Path
+import re
+
+from mypy import api
+import pytest
+
+from plshandle._cli_utils.collect_errors import collect_errors
+from plshandle.tests import cli, RESOURCE_DIR
+
+PACKAGES = ["test_simple", "test_aliases", "test_subclasses", "test_advanced", "test_unions"]
+
+CONFIG = """[mypy]
+plugins = plshandle.plugin
+mypy_path = {resources}
+cache_dir = {cache}
+incremental = False
+namespace_packages = True
+check_untyped_defs = True
+"""
+
+
+def _absolute(error: str) -> str:
+    path, rest = error.split(":", 1)
+    rest = re.sub(r"\s+\[[a-z-]+\]$", "", rest)  # error codes appended by newer mypy versions
+    return "{}:{}".format(Path(path).resolve(), rest)
+
+
+@pytest.mark.parametrize(
+    "packages,setting",
+    [(PACKAGES, None), (["test_simple"], "strict"), (["test_match_subclasses"], "match_subclasses")],
+    ids=["default", "strict", "match_subclasses"],
+)
+def test_plugin(tmp_path, monkeypatch, packages, setting):
+    """Assert that the plugin reports the same contract violations as ``collect_errors()``, with
+    the settings read from ``pyproject.toml`` just like the command line interface does.
+    """
+    monkeypatch.chdir(tmp_path)
+    if setting:
+        (tmp_path / "pyproject.toml").write_text("[tool.plshandle]\n{} = true\n".format(setting))
+    config = tmp_path / "mypy.ini"
+    config.write_text(CONFIG.format(resources=RESOURCE_DIR, cache=os.devnull))
+    args = [arg for package in packages for arg in ("-p", package)]
+
+    stdout, _, _ = api.run(["--config-file", str(config)] + args)
+    reported = {
+        _absolute(line.replace(" error:", "", 1))
+        for line in stdout.splitlines()
+        if "Violated contract" in line or "not handled at level 1" in line
+    }
+
+    expected = {_absolute(error) for error in collect_errors(cli(args))}
+    assert expected
+    assert reported == expected
@@ -0,0 +1,30 @@
+"""Test the time and memory measurements of --profile."""
+
+import json
+import pstats
+
+from plshandle._cli_utils.build_profile import build_profile
+from plshandle.tests import cli
+
+
+def test_profile(tmp_path):
+    """Assert that all phases and checked modules are measured and cProfile stats are dumped."""
+    stats_file = str(tmp_path / "check.pstats")
+    output = cli(["-p", "test_simple", "-p", "test_skip_modules", "--profile-stats", stats_file])
+
+    assert [phase.name for phase in output.profile.phases] == [
+        "gather modules",
+        "mypy build",
+        "collect contracts",
+        "check contracts",
+    ]
+    assert all(phase.wall_time >= 0 and phase.cpu_time >= 0 for phase in output.profile.phases)
+    checked = {result.source.module for result in output.results if result.reports}
+    assert checked <= set(output.profile.modules)
+    assert "test_skip_modules.unrelated" not in output.profile.modules  # skipped
+    assert pstats.Stats(stats_file).total_calls > 0
+
+    assert "mypy build" in build_profile(output)
+    json_output = cli(["-p", "test_simple", "--profile", "--json"])
+    profile = json.loads(build_profile(json_output))
+    assert [module["module"] for module in profile["slowest_modules"]] == ["test_simple.module"]
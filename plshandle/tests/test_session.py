@@ -0,0 +1,93 @@
+"""Test that a session reuses its build between checks and does not change sys.path."""
+
+import os
+import sys
+
+from mypy.options import Options
+
+from plshandle import Session
+
+LIB = """from plshandle import plshandle
+
+
+@plshandle(KeyError)
+def foo():
+    pass
+"""
+
+CALLER = """from session_package.lib import foo
+
+
+def bar():
+    foo()
+"""
+
+HANDLING_CALLER = """from session_package.lib import foo
+
+
+def bar():
+    try:
+        foo()
+    except KeyError:
+        pass
+"""
+
+
+def _options():
+    options = Options()
+    options.incremental = False
+    options.cache_dir = os.devnull
+    return options
+
+
+def _handled(result):
+    return [
+        exception.is_handled
+        for module in result.results
+        for report in module.reports
+        for exception in report.results
+    ]
+
+
+def test_session(tmp_path):
+    """Assert that only changed modules are checked again, whether the change is detected or
+    passed to ``update()``, and that ``sys.path`` is left alone.
+    """
+    package = tmp_path / "session_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "lib.py").write_text(LIB)
+    (package / "caller.py").write_text(CALLER)
+    (package / "other.py").write_text("X = 1\n")
+    path = list(sys.path)
+    session = Session(_options)
+
+    first = session.check(directories=[str(tmp_path)])
+    assert first.statistics["checked modules"] == 2
+    assert first.statistics["skipped modules"] == 1
+    assert _handled(first) == [False]
+    assert sys.path == path
+
+    (package / "caller.py").write_text(HANDLING_CALLER)
+    second = session.check(directories=[str(tmp_path)])
+    assert second.statistics["checked modules"] == 1
+    assert second.statistics["reused contracts"] == 2
+    assert _handled(second) == [True]
+
+    # same size and modification time, only noticed if passed to update()
+    stat = os.stat(package / "caller.py")
+    (package / "caller.py").write_text(HANDLING_CALLER.replace("KeyError", "EOFError"))
+    os.utime(package / "caller.py", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert session.update([str(package / "caller.py")]) == {"session_package.caller"}
+    assert sys.path == path
+
+    third = session.check(directories=[str(tmp_path)])
+    assert third.statistics["checked modules"] == 1
+    assert _handled(third) == [False]
+    assert session.check(directories=[str(tmp_path)]).statistics["checked modules"] == 0
+    assert sys.path == path
+
+
+def test_update_before_check():
+    """Assert that updates before the first check are ignored."""
+    assert Session(_options).update(["module.py"]) == set()
@@ -0,0 +1,71 @@
+"""Test that the shards of a run can be merged into the results of a single run."""
+
+import pytest
+
+from plshandle.__main__ import main
+from plshandle._cli_utils.build_json import build_json, load_json
+from plshandle._cli_utils.determine_exit_code import determine_exit_code
+from plshandle._gather_modules import gather_modules
+from plshandle._records import ModuleRecord
+from plshandle._shard import parse_shard, shard_modules
+from plshandle.tests import cli
+
+
+def test_parse_shard():
+    """Assert that only shards I/N with 1 <= I <= N are accepted."""
+    assert parse_shard("2/3") == (2, 3)
+    for value in ("0/3", "4/3", "3", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+    assert cli(["-p", "test_simple", "--shard", "4/3"]).config.help_requested
+
+
+def test_shard_modules():
+    """Assert that the shards partition the modules, keep their order and do not depend on it."""
+    modules = list(gather_modules([], ["test_simple", "test_unions", "test_aliases"], [], []))
+    shards = [shard_modules(modules, index, 3) for index in (1, 2, 3)]
+
+    assert sorted(source.module for shard in shards for source in shard) == sorted(
+        source.module for source in modules
+    )
+    assert all(shard for shard in shards)
+    for shard in shards:
+        assert shard == [source for source in modules if source in shard]
+    assert [shard_modules(modules[::-1], index, 3)[::-1] for index in (1, 2, 3)] == shards
+
+
+def test_merge(tmp_path, capsys):
+    """Assert that merging the JSON outputs of all shards yields the results and exit code of a
+    single run.
+    """
+    args = ["-p", "test_simple", "-p", "test_unions", "-p", "test_aliases"]
+    single = cli(args)
+    files = []
+    for index in (1, 2, 3):
+        shard = cli(args + ["--shard", "{}/3".format(index)])
+        assert shard.statistics["shard modules"] == len(shard.records)
+        files.append(tmp_path / "shard{}.json".format(index))
+        files[-1].write_text(build_json(shard.records))
+    capsys.readouterr()
+
+    merged = tmp_path / "merged.json"
+    code = main(["merge", "--output", str(merged)] + [str(file) for file in files])
+    assert code == determine_exit_code(single) == 1
+    assert sorted(load_json(merged.read_text())) == sorted(single.records)
+    assert capsys.readouterr().err
+
+
+def test_merge_empty(tmp_path, capsys):
+    """Assert that merging shards without results is an error."""
+    empty = tmp_path / "empty.json"
+    empty.write_text(build_json([]))
+    assert main(["merge", "--json", str(empty)]) == 10
+    assert capsys.readouterr().out.strip() == "[]"
+
+
+def test_merge_unchecked(tmp_path, capsys):
+    """Assert that merging shards without any checked contract is an error."""
+    unchecked = tmp_path / "unchecked.json"
+    unchecked.write_text(build_json([ModuleRecord("module", "module.py", ())]))
+    assert main(["merge", str(unchecked), str(unchecked)]) == 12
+    assert not capsys.readouterr().out
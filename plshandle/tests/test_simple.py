@@ -6,7 +6,8 @@ from plshandle.tests import cli, transform_results, Result, Contract
 def test_simple():
     """Assert that contracts are handled as described in resources/test_simple/module.py."""
     args = ["-m", "test_simple.module"]
-    contracts = transform_results(cli(args).results)
+    output = cli(args)
+    contracts = transform_results(output.results)
     assert contracts == {
         Contract(
             function="test_simple.module.foo",
@@ -42,3 +43,12 @@ def test_simple():
             ),
         ),
     }
+
+    # each try statement and decorator is resolved once, the scopes enclosed by them inherit them
+    assert output.statistics == {
+        "skipped modules": 0,
+        "handler cache hits": 0,
+        "handler cache misses": 3,
+        "method cache hits": 0,
+        "method cache misses": 2,
+    }
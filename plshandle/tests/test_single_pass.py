@@ -0,0 +1,38 @@
+"""Test that collecting and checking contracts in a single pass yields the same output."""
+
+from plshandle._cli_utils.build_json import build_json
+from plshandle._cli_utils.collect_errors import collect_errors
+from plshandle.tests import cli
+
+ARGS = ["-p", "test_simple", "-p", "test_unions", "-p", "test_aliases", "-p", "test_subclasses"]
+
+
+def _contracts(output):
+    return [
+        (c.function.fullname, [t.fullname for t in c.exception_types], c.source.module)
+        for c in output.contracts
+    ]
+
+
+def test_single_pass():
+    """Assert that contracts, results, JSON and errors are identical to separate passes."""
+    separate = cli(ARGS)
+    single = cli(ARGS + ["--single-pass"])
+
+    assert [phase.name for phase in single.profile.phases][-1] == "collect and check contracts"
+    assert _contracts(single) == _contracts(separate)
+    assert [result.source.module for result in single.results] == [
+        result.source.module for result in separate.results
+    ]
+    assert build_json(single.records) == build_json(separate.records)
+    assert list(collect_errors(single)) == list(collect_errors(separate))
+
+
+def test_single_pass_shard():
+    """Assert that a shard checked in a single pass still knows the contracts of all modules."""
+    for index in (1, 2):
+        args = ARGS + ["--shard", "{}/2".format(index), "--compact"]
+        separate = cli(args)
+        single = cli(args + ["--single-pass"])
+        assert _contracts(single) == _contracts(separate)
+        assert build_json(single.records) == build_json(separate.records)
@@ -0,0 +1,30 @@
+"""Test that modules which cannot call any contract function are not traversed."""
+
+from plshandle.tests import cli, transform_results, Result, Contract
+
+
+def test_skip_modules():
+    """Assert that only unrelated.py is skipped and contracts reached through other modules are
+    still checked as described in resources/test_skip_modules.
+    """
+    result = cli(["-p", "test_skip_modules"])
+    assert result.statistics["skipped modules"] == 1
+    assert [check.source.module for check in result.results] == [
+        source.module for source in result.modules
+    ]
+    assert transform_results(result.results) == {
+        Contract(
+            function="test_skip_modules.contracts.foo",
+            scope="test_skip_modules.caller.call",
+            line=5,
+            results=(Result("builtins.KeyError", is_propagated=False, is_handled=False, level=0),),
+        ),
+        Contract(
+            function="test_skip_modules.contracts.Bar.method",
+            scope="test_skip_modules.caller.call",
+            line=6,
+            results=(
+                Result("builtins.ValueError", is_propagated=False, is_handled=False, level=0),
+            ),
+        ),
+    }
@@ -0,0 +1,91 @@
+"""Test that watch mode checks again once files of the checked modules change."""
+
+import io
+import os
+
+from mypy.options import Options
+
+from plshandle._cli_utils.config import Config
+from plshandle._watch import Watcher
+
+LIB = """from plshandle import plshandle
+
+
+@plshandle(KeyError)
+def foo():
+    pass
+"""
+
+CALLER = """from watch_package.lib import foo
+
+
+def bar():
+    foo()
+"""
+
+HANDLING_CALLER = """from watch_package.lib import foo
+
+
+def bar():
+    try:
+        foo()
+    except KeyError:
+        pass
+"""
+
+
+def _options():
+    options = Options()
+    options.incremental = False
+    options.cache_dir = os.devnull
+    return options
+
+
+def _handled(result):
+    return [
+        exception.is_handled
+        for module in result.results
+        for report in module.reports
+        for exception in report.results
+    ]
+
+
+def test_watcher(tmp_path, monkeypatch):
+    """Assert that changed and added files are noticed and only affected modules are checked."""
+    package = tmp_path / "watch_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "lib.py").write_text(LIB)
+    (package / "caller.py").write_text(CALLER)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    watcher = Watcher(Config(package=["watch_package"]), _options)
+
+    first = watcher.check()
+    assert _handled(first) == [False]
+    assert not watcher.changed()
+
+    (package / "caller.py").write_text(HANDLING_CALLER + "\n")
+    assert watcher.changed()
+    second = watcher.check()
+    assert second.statistics["checked modules"] == 1
+    assert _handled(second) == [True]
+    assert not watcher.changed()
+
+    (package / "other.py").write_text(CALLER)
+    assert watcher.changed()
+    third = watcher.check()
+    assert len(third.modules) == 3
+    assert _handled(third) == [True, False]
+
+
+def test_run(tmp_path, monkeypatch):
+    """Assert that the output is printed until interrupted, returning the last exit code."""
+    watcher = Watcher(Config(directory=[str(tmp_path)]), _options)
+
+    def interrupt():
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(watcher, "changed", interrupt)
+    stderr = io.StringIO()
+    assert watcher.run(io.StringIO(), stderr) == 10
+    assert "Watching for file changes" in stderr.getvalue()
@@ -9,10 +9,17 @@ with open("README.md", "r") as readme:
         long_description_content_type="text/markdown",
         url="https://github.com/v7a/plshandle",
         keywords=["exception", "contract", "error handling"],
-        install_requires=["mypy >= 0.750", "setuptools >= 41.0", "toml >= 0.10",],
+        install_requires=["mypy >= 0.750", "toml >= 0.10",],
         package_data={"plshandle": ["py.typed"]},
         packages=setuptools.find_namespace_packages(
-            exclude=("plshandle.tests", "plshandle.tests.*", "doc", "doc.*")
+            exclude=(
+                "plshandle.tests",
+                "plshandle.tests.*",
+                "doc",
+                "doc.*",
+                "benchmarks",
+                "benchmarks.*",
+            )
         ),
         project_urls={
             "Documentation": "https://plshandle.readthedocs.io",